@@ -0,0 +1,343 @@
+"""
+MarketPulse Bench - offline full-cycle benchmark
+Serves thousands of synthetic RSS/Atom feeds from a local server process
+(one port per "domain"), points SourceManager at them and runs full
+NewsEngine cycles. Nothing leaves the machine.
+
+Reports per cycle: feeds/s, p50/p99 per-feed fetch latency, new items;
+at the end: CPU (engine + parse processes), peak RSS, response mix and
+mean time per pipeline stage. Same flags + same seed → comparable runs.
+
+    python bench.py --feeds 2000 --domains 100 --cycles 3
+    python bench.py --mode async --latency 0.2 --p429 0.02 --json base.json
+"""
+
+import argparse
+import asyncio
+import json
+import multiprocessing
+import os
+import random
+import resource
+import sys
+import tempfile
+import threading
+import time
+import logging
+from datetime import datetime, timezone, timedelta
+from email.utils import format_datetime
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+WORDS = (
+    "bitcoin ether stocks rally slump fed rates inflation earnings guidance "
+    "nasdaq futures yields dollar gold oil tariffs merger buyback upgrade "
+    "downgrade record surge plunge outlook quarter revenue chip bank crypto "
+    "etf approval probe lawsuit layoffs forecast jobs report cpi treasury"
+).split()
+
+
+# ─────────────────────────────────────────────
+# SYNTHETIC FEED SERVER  (runs in its own process)
+# ─────────────────────────────────────────────
+
+class FeedServer:
+    """
+    Feed i lives at /feed/<i>.xml. Every request draws from an RNG seeded by
+    (seed, feed, request number), so a run is reproducible request by request:
+
+      latency   — uniform 0.5–1.5 × `latency` seconds before answering
+      403 / 429 — with probability p403 / p429 (429 carries Retry-After: 1)
+      churn     — probability that the feed gained a new item since last time
+      ETag      — a feed sends one with probability `etag`; If-None-Match on
+                  an unchanged feed gets 304
+      size      — `items` entries of roughly `item_bytes` each; `atom` is the
+                  share of feeds served as Atom instead of RSS
+    """
+
+    def __init__(self, cfg: dict):
+        self.cfg      = cfg
+        self._version = {}                  # feed → newest item id
+        self._count   = {}                  # feed → requests so far
+        self._lock    = threading.Lock()
+
+    def _rng(self, *key) -> random.Random:
+        return random.Random(":".join(map(str, (self.cfg["seed"],) + key)))
+
+    def _title(self, feed: int, item: int) -> str:
+        rng = self._rng(feed, "item", item)
+        return " ".join(rng.choice(WORDS) for _ in range(rng.randint(6, 12))).capitalize()
+
+    def body(self, feed: int, version: int, atom: bool) -> bytes:
+        cfg   = self.cfg
+        now   = datetime(2026, 1, 1, tzinfo=timezone.utc) + timedelta(minutes=version)
+        pad   = "x" * max(0, cfg["item_bytes"] - 200)
+        parts = []
+        for item in range(version, version - cfg["items"], -1):
+            title = self._title(feed, item)
+            link  = f"https://bench.example/{feed}/{item}?utm_source=bench"
+            when  = now - timedelta(minutes=version - item)
+            if atom:
+                parts.append(
+                    f"<entry><title>{title}</title><link href=\"{link}\"/>"
+                    f"<updated>{when.isoformat()}</updated><summary>{pad}</summary></entry>"
+                )
+            else:
+                parts.append(
+                    f"<item><title>{title}</title><link>{link}</link>"
+                    f"<pubDate>{format_datetime(when)}</pubDate><description>{pad}</description></item>"
+                )
+        if atom:
+            doc = (
+                '<?xml version="1.0" encoding="utf-8"?><feed xmlns="http://www.w3.org/2005/Atom">'
+                f"<title>Bench {feed}</title><updated>{now.isoformat()}</updated>{''.join(parts)}</feed>"
+            )
+        else:
+            doc = (
+                '<?xml version="1.0" encoding="utf-8"?><rss version="2.0"><channel>'
+                f"<title>Bench {feed}</title><lastBuildDate>{format_datetime(now)}</lastBuildDate>"
+                f"{''.join(parts)}</channel></rss>"
+            )
+        return doc.encode()
+
+    def respond(self, feed: int, if_none_match: str) -> tuple:
+        """→ (status, headers, body)"""
+        cfg = self.cfg
+        with self._lock:
+            n = self._count[feed] = self._count.get(feed, 0) + 1
+            rng = self._rng(feed, "request", n)
+            version = self._version.setdefault(feed, cfg["items"])
+            if rng.random() < cfg["churn"]:
+                version = self._version[feed] = version + 1
+        time.sleep(cfg["latency"] * rng.uniform(0.5, 1.5))
+
+        roll = rng.random()
+        if roll < cfg["p403"]:
+            return 403, {}, b""
+        if roll < cfg["p403"] + cfg["p429"]:
+            return 429, {"Retry-After": "1"}, b""
+
+        traits  = self._rng(feed, "traits")
+        atom    = traits.random() < cfg["atom"]
+        headers = {"Content-Type": "application/atom+xml" if atom else "application/rss+xml"}
+        if traits.random() < cfg["etag"]:
+            etag = f'"{feed}-{version}"'
+            if if_none_match == etag:
+                return 304, {"ETag": etag}, b""
+            headers["ETag"] = etag
+        return 200, headers, self.body(feed, version, atom)
+
+
+def _serve(cfg: dict, ports, ready):
+    """Server process: one ThreadingHTTPServer per domain port, all sharing one FeedServer."""
+    feeds = FeedServer(cfg)
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"       # keep-alive, like a real publisher
+
+        def log_message(self, *args):
+            pass
+
+        def do_GET(self):
+            try:
+                feed = int(self.path.split("/feed/")[1].split(".")[0])
+            except (IndexError, ValueError):
+                feed = None
+            if feed is None:
+                status, headers, body = 404, {}, b""
+            else:
+                status, headers, body = feeds.respond(feed, self.headers.get("If-None-Match"))
+            self.send_response(status)
+            for key, value in headers.items():
+                self.send_header(key, value)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+    servers = []
+    for _ in range(ports):
+        server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        server.daemon_threads = True
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        servers.append(server)
+    ready.put([s.server_address[1] for s in servers])
+    threading.Event().wait()
+
+
+# ─────────────────────────────────────────────
+# HELPERS
+# ─────────────────────────────────────────────
+
+def percentile(values: list, pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+def cpu_seconds(who) -> float:
+    usage = resource.getrusage(who)
+    return usage.ru_utime + usage.ru_stime
+
+
+def timed_fetch(pool, samples: list):
+    """Wrap pool.fetch_once (sync or async) to record each attempt's duration."""
+    fetch = pool.fetch_once
+
+    if asyncio.iscoroutinefunction(fetch):
+        async def wrapped(*args, **kwargs):
+            started = time.perf_counter()
+            try:
+                return await fetch(*args, **kwargs)
+            finally:
+                samples.append(time.perf_counter() - started)
+    else:
+        def wrapped(*args, **kwargs):
+            started = time.perf_counter()
+            try:
+                return fetch(*args, **kwargs)
+            finally:
+                samples.append(time.perf_counter() - started)
+    pool.fetch_once = wrapped
+
+
+# ─────────────────────────────────────────────
+# MAIN
+# ─────────────────────────────────────────────
+
+def main():
+    cli = argparse.ArgumentParser(description="Offline NewsEngine cycle benchmark")
+    cli.add_argument("--feeds",      type=int,   default=2000, help="synthetic feeds")
+    cli.add_argument("--domains",    type=int,   default=100,  help="server ports = distinct domains")
+    cli.add_argument("--cycles",     type=int,   default=3)
+    cli.add_argument("--mode",       default="threads", choices=("threads", "async"))
+    cli.add_argument("--workers",    type=int,   default=50,   help="threads mode: fetch threads")
+    cli.add_argument("--concurrency", type=int,  default=1000, help="async mode: feeds in flight")
+    cli.add_argument("--parse-processes", type=int, default=None, help="None = one per core, 0 = inline")
+    cli.add_argument("--storage",    default="sqlite", choices=("sqlite", "csv"))
+    cli.add_argument("--latency",    type=float, default=0.05, help="mean server latency (s)")
+    cli.add_argument("--items",      type=int,   default=20,   help="entries per feed body")
+    cli.add_argument("--item-bytes", type=int,   default=600,  help="approx. bytes per entry")
+    cli.add_argument("--atom",       type=float, default=0.3,  help="share of Atom feeds")
+    cli.add_argument("--etag",       type=float, default=0.6,  help="share of feeds sending ETags")
+    cli.add_argument("--churn",      type=float, default=0.3,  help="chance a feed changed per request")
+    cli.add_argument("--p429",       type=float, default=0.01)
+    cli.add_argument("--p403",       type=float, default=0.0,  help="note: a 403 trips the whole domain")
+    cli.add_argument("--seed",       type=int,   default=1)
+    cli.add_argument("--json",       default=None, help="also write the results here")
+    cli.add_argument("--verbose",    action="store_true", help="engine log on the console too")
+    args = cli.parse_args()
+
+    cfg = {k: getattr(args, k) for k in ("latency", "items", "item_bytes", "atom", "etag", "churn", "p429", "p403", "seed")}
+    ctx   = multiprocessing.get_context("spawn")
+    ready = ctx.Queue()
+    server = ctx.Process(target=_serve, args=(cfg, args.domains, ready), daemon=True)
+    server.start()
+    ports = ready.get(timeout=60)
+
+    # Fresh state every run (breaker, caches, schedule, DB) — engine.log lands here too
+    json_out = os.path.abspath(args.json) if args.json else None
+    workdir  = tempfile.mkdtemp(prefix="marketpulse-bench-")
+    sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+    os.chdir(workdir)
+    import main as engine_mod
+    if not args.verbose:
+        for handler in list(logging.getLogger().handlers):
+            if type(handler) is logging.StreamHandler:
+                logging.getLogger().removeHandler(handler)
+
+    cats  = ("Stock", "Crypto", "Finance", "Macro")
+    feeds = {
+        f"Bench-{i:05d}": (f"http://127.0.0.1:{ports[i % len(ports)]}/feed/{i}.xml", cats[i % len(cats)])
+        for i in range(args.feeds)
+    }
+    engine_mod.SourceManager.get_all_feeds = lambda self, *a, **k: dict(feeds)
+
+    engine = engine_mod.NewsEngine(
+        max_workers     = args.workers,
+        max_concurrency = args.concurrency,
+        fetch_mode      = args.mode,
+        scheduling      = "cycle",
+        storage         = args.storage,
+        parse_processes = args.parse_processes,
+    )
+    samples: list = []
+    timed_fetch(engine.async_pool if engine.async_pool else engine.worker_pool, samples)
+    completed = [0]
+    store = engine._store
+
+    def counted_store(name, result):
+        completed[0] += 1
+        return store(name, result)
+    engine._store = counted_store
+
+    print(f"bench: {args.feeds:,} feeds on {len(ports)} domains | {args.mode} | workdir {workdir}")
+    cpu_start = cpu_seconds(resource.RUSAGE_SELF)
+    rows, total_start = [], time.perf_counter()
+    for cycle in range(1, args.cycles + 1):
+        samples.clear()
+        completed[0] = 0
+        before  = len(engine.warehouse)
+        started = time.perf_counter()
+        engine._run_cycle()
+        seconds = time.perf_counter() - started
+        row = {
+            "cycle":   cycle,
+            "seconds": round(seconds, 2),
+            "feeds":   completed[0],
+            "feeds_per_s": round(completed[0] / seconds, 1),
+            "fetches": len(samples),
+            "p50_ms":  round(percentile(samples, 50) * 1000, 1),
+            "p99_ms":  round(percentile(samples, 99) * 1000, 1),
+            "new_items": len(engine.warehouse) - before,
+        }
+        rows.append(row)
+        print(
+            f"  cycle {cycle}: {row['seconds']:>7.2f}s | {row['feeds']:>6,} feeds | "
+            f"{row['feeds_per_s']:>7.1f} feeds/s | p50 {row['p50_ms']:>7.1f} ms | "
+            f"p99 {row['p99_ms']:>7.1f} ms | +{row['new_items']:,} items"
+        )
+    wall = time.perf_counter() - total_start
+    cpu_engine = cpu_seconds(resource.RUSAGE_SELF) - cpu_start
+    if engine.parser:
+        engine.parser.close()             # reaps the parse processes → their CPU shows up below
+    cpu_parse = cpu_seconds(resource.RUSAGE_CHILDREN)
+    peak_rss  = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024   # KiB on Linux
+
+    counters, hists = engine_mod.metrics.snapshot()
+    responses: dict = {}
+    for (name, labels), value in counters.items():
+        if name == "marketpulse_responses_total":
+            status = dict(labels)["status"]
+            responses[status] = responses.get(status, 0) + int(value)
+    stages = {
+        dict(labels)["stage"]: round(total / count * 1000, 3)
+        for (name, labels), (count, total) in hists.items()
+        if name == "marketpulse_stage_seconds" and count
+    }
+    summary = {
+        "config":  {**vars(args), "ports": len(ports)},
+        "cycles":  rows,
+        "wall_s":  round(wall, 2),
+        "feeds_per_s": round(sum(r["feeds"] for r in rows) / wall, 1),
+        "cpu_engine_s": round(cpu_engine, 2),
+        "cpu_parse_s":  round(cpu_parse, 2),
+        "peak_rss_mb":  round(peak_rss, 1),
+        "responses": responses,
+        "stage_mean_ms": stages,
+    }
+    print(
+        f"total: {summary['wall_s']}s | {summary['feeds_per_s']} feeds/s | "
+        f"CPU engine {summary['cpu_engine_s']}s + parse {summary['cpu_parse_s']}s | "
+        f"peak RSS {summary['peak_rss_mb']} MB"
+    )
+    print(f"responses: {responses}")
+    print("stage mean (ms): " + ", ".join(f"{k}={v}" for k, v in sorted(stages.items())))
+    if json_out:
+        with open(json_out, "w", encoding="utf-8") as f:
+            json.dump(summary, f, indent=2)
+        print(f"wrote {json_out}")
+    server.terminate()
+
+
+if __name__ == "__main__":
+    main()
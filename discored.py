@@ -14,7 +14,7 @@ import queue
 import logging
 import sys
 from datetime import datetime, timezone
-from collections import deque
+from collections import deque, Counter, OrderedDict
 from pathlib import Path
 from dotenv import load_dotenv
 
@@ -26,6 +26,8 @@ load_dotenv()
 TOKEN = os.getenv("DISCORD_TOKEN")
 
 CSV_PATH = "/home/whsg/bot/market_news_warehouse.csv"
+SEEN_PATH = str(Path(CSV_PATH).with_name("discord_seen_ids.txt"))   # survives restarts
+SEEN_MAX  = 50000      # message IDs remembered for dedup
 
 CHANNELS = [
     "1359862685826678835",  # Speed Wallet - general-chat
@@ -42,6 +44,12 @@ CHANNEL_NAMES = {
     "1393197548017291325": "Discord/SpeedWallet/SAIF-TRADES",
 }
 
+# Writer: rows are written in groups — one buffered write per group
+BATCH_SIZE    = 200    # max rows per write
+BATCH_LATENCY = 1.0    # seconds a row may wait for its group to fill up
+FSYNC_EVERY   = 5.0    # seconds between fsyncs (0 = every group, None = leave it to the OS)
+SUMMARY_EVERY = 30     # seconds between console summaries
+
 KEYWORDS = [
     "BTC", "ETH", "SOL", "XRP", "BNB", "DOGE", "ADA", "AVAX",
     "AAPL", "TSLA", "NVDA", "SPY", "QQQ", "GME",
@@ -64,11 +72,9 @@ logging.getLogger("discum").setLevel(logging.CRITICAL)
 logging.getLogger("websocket").setLevel(logging.CRITICAL)
 
 # ─────────────────────────────────────────────
-# CSV — thread-safe append
+# CSV — batched writer, one persistent handle
 # ─────────────────────────────────────────────
 
-csv_lock = threading.Lock()
-
 def ensure_csv():
     p = Path(CSV_PATH)
     if not p.exists():
@@ -81,10 +87,67 @@ def ensure_csv():
         kb = p.stat().st_size / 1024
         log.info(f"✅ Found existing CSV: {CSV_PATH} ({kb:.1f} KB) — appending")
 
-def append_row(source, category, content, url, date):
-    with csv_lock:
-        with open(CSV_PATH, "a", newline="", encoding="utf-8") as f:
-            csv.writer(f).writerow([source, category, content, url, date, date])
+class CsvWriter:
+    """
+    Keeps CSV_PATH open for appending. write() puts a whole group of rows
+    into the buffer and flushes once — one write syscall per group instead
+    of open/write/close per message. fsync runs at most every FSYNC_EVERY
+    seconds, and the worker calls idle() once traffic stops, so a power cut
+    costs at most that much; a crash of the process itself loses nothing
+    that write() returned for.
+    """
+
+    def __init__(self, path, fsync_every=FSYNC_EVERY):
+        self.path = path
+        self.fsync_every = fsync_every
+        self.f = None
+        self.dirty = False        # rows written since the last fsync
+        self.last_sync = time.monotonic()
+
+    def _open(self):
+        if self.f is None:
+            self.f = open(self.path, "a", newline="", encoding="utf-8", buffering=1 << 16)
+            self.w = csv.writer(self.f)
+
+    def write(self, rows):
+        self._open()
+        try:
+            self.w.writerows(rows)
+            self.f.flush()
+        except OSError:
+            self.close()          # reopen on the next group
+            raise
+        self.dirty = True
+        if self.fsync_every is not None and time.monotonic() - self.last_sync >= self.fsync_every:
+            self.sync()
+
+    def sync_in(self):
+        """Seconds until unsynced rows are due for fsync (None = nothing to sync)."""
+        if not self.dirty or self.fsync_every is None:
+            return None
+        return max(0.0, self.fsync_every - (time.monotonic() - self.last_sync))
+
+    def idle(self):
+        """No rows arrived: fsync what the last groups left unsynced once it is due."""
+        due = self.sync_in()
+        if due is not None and due <= 0:
+            self.sync()
+
+    def sync(self):
+        if self.f is not None:
+            os.fsync(self.f.fileno())
+        self.dirty = False
+        self.last_sync = time.monotonic()
+
+    def close(self):
+        if self.f is not None:
+            try:
+                self.f.flush()
+                self.sync()
+                self.f.close()
+            except OSError:
+                pass
+            self.f = None
 
 # ─────────────────────────────────────────────
 # SENTIMENT
@@ -105,17 +168,74 @@ def sentiment(text):
 # DEDUPLICATION
 # ─────────────────────────────────────────────
 
-seen = set()
+seen = OrderedDict()      # message ID → None, least recently seen first
 seen_lock = threading.Lock()
 
 def is_dup(mid):
+    """LRU of the last SEEN_MAX IDs — hit and eviction are both O(1)."""
     with seen_lock:
-        if mid in seen: return True
-        seen.add(mid)
-        if len(seen) > 50000:
-            [seen.discard(x) for x in list(seen)[:10000]]
+        if mid in seen:
+            seen.move_to_end(mid)
+            return True
+        seen[mid] = None
+        if len(seen) > SEEN_MAX:
+            seen.popitem(last=False)
         return False
 
+def load_seen():
+    """Restore the newest SEEN_MAX IDs from SEEN_PATH, so a restart doesn't re-ingest."""
+    if not Path(SEEN_PATH).exists():
+        return
+    with open(SEEN_PATH, encoding="utf-8") as f:
+        ids = deque((line.strip() for line in f if line.strip()), maxlen=SEEN_MAX)
+    with seen_lock:
+        for mid in ids:
+            seen[mid] = None
+            seen.move_to_end(mid)
+    log.info(f"✅ Loaded {len(ids)} seen message IDs from {SEEN_PATH}")
+
+class SeenLog:
+    """
+    Append-only record of the IDs whose rows reached the CSV — written by
+    the writer thread after each group, so an ID is never remembered for a
+    message that was lost in the queue. Once it holds 2 × SEEN_MAX lines it
+    is rewritten (tmp file + os.replace) down to the newest SEEN_MAX.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.f = None
+        self.lines = 0
+        if Path(path).exists():
+            with open(path, encoding="utf-8") as f:
+                self.lines = sum(1 for _ in f)
+
+    def add(self, mids):
+        if self.f is None:
+            self.f = open(self.path, "a", encoding="utf-8")
+        self.f.write("".join(f"{m}\n" for m in mids))
+        self.f.flush()
+        self.lines += len(mids)
+        if self.lines >= 2 * SEEN_MAX:
+            self.compact()
+
+    def compact(self):
+        self.close()
+        with open(self.path, encoding="utf-8") as f:
+            ids = deque(f, maxlen=SEEN_MAX)
+        tmp = self.path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.writelines(ids)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, self.path)
+        self.lines = len(ids)
+
+    def close(self):
+        if self.f is not None:
+            self.f.close()
+            self.f = None
+
 # ─────────────────────────────────────────────
 # ALERT QUEUE — background writer thread
 # ─────────────────────────────────────────────
@@ -123,36 +243,81 @@ def is_dup(mid):
 q = queue.Queue()
 signals_saved = 0
 
+def to_row(item):
+    channel_id, author, content, found, mid = item
+    now = datetime.now(timezone.utc).isoformat()
+    source = CHANNEL_NAMES.get(channel_id, f"Discord/{channel_id}")
+    url = f"https://discord.com/channels/@me/{channel_id}/{mid}"
+    return [source, sentiment(content), f"[{author}] {content}", url, now, now]
+
+def next_batch(wait=SUMMARY_EVERY):
+    """Wait for a first item (up to `wait`), then take more until BATCH_SIZE or BATCH_LATENCY."""
+    try:
+        batch = [q.get(timeout=wait)]
+    except queue.Empty:
+        return []
+    deadline = time.monotonic() + BATCH_LATENCY
+    while batch[-1] is not None and len(batch) < BATCH_SIZE:
+        remaining = deadline - time.monotonic()
+        try:
+            batch.append(q.get(timeout=remaining) if remaining > 0 else q.get_nowait())
+        except queue.Empty:
+            break
+    return batch
+
 def worker():
     global signals_saved
-    while True:
+    out = CsvWriter(CSV_PATH)
+    remembered = SeenLog(SEEN_PATH)
+    pending = []                                   # rows whose write failed — retried first
+    window = Counter()                             # channel → rows since the last summary
+    last_summary = time.monotonic()
+    last_row = None
+    running = True
+
+    while running or pending:
+        if running:
+            # Wake up in time to fsync the tail of a burst once traffic stops
+            sync_in = out.sync_in()
+            batch = next_batch(SUMMARY_EVERY if sync_in is None else min(SUMMARY_EVERY, sync_in + 0.05))
+            if not batch:
+                try:
+                    out.idle()
+                except OSError as e:
+                    log.error(f"Worker error: fsync failed: {e}")
+            if batch and batch[-1] is None:
+                running = False
+            items = [i for i in batch if i is not None]
+            pending += [to_row(i) for i in items]
+            for _ in batch:
+                q.task_done()
         try:
-            item = q.get(timeout=2)
-            if item is None:
+            if pending:
+                out.write(pending)
+                written, pending = pending, []
+                signals_saved += len(written)
+                window.update(r[0].split("/")[-1] for r in written)
+                last_row = written[-1]
+                remembered.add([r[3].rsplit("/", 1)[-1] for r in written])   # message ID ends the URL
+        except Exception as e:
+            log.error(f"Worker error: {e} — {len(pending)} row(s) kept for retry")
+            if not running:
                 break
+            time.sleep(1)
+
+        now = time.monotonic()
+        if window and (now - last_summary >= SUMMARY_EVERY or not running):
+            top = ", ".join(f"#{c} {n}" for c, n in window.most_common(3))
+            last = last_row[2][:80].replace("\n", " ")
+            log.info(
+                f"💾 +{sum(window.values())} saved in {now - last_summary:.0f}s "
+                f"(total {signals_saved}) | {top} | last: {last}"
+            )
+            window.clear()
+            last_summary = now
 
-            channel_id, author, content, found, mid = item
-            now = datetime.now(timezone.utc).isoformat()
-            source = CHANNEL_NAMES.get(channel_id, f"Discord/{channel_id}")
-            cat = sentiment(content)
-            url = f"https://discord.com/channels/@me/{channel_id}/{mid}"
-
-            append_row(source, cat, f"[{author}] {content}", url, now)
-            signals_saved += 1
-
-            ts = datetime.now().strftime("%H:%M:%S")
-            kw_str = ", ".join(found) if found else "—"
-            print(f"\n{'─'*55}")
-            print(f"⚡ [{ts}]  #{source.split('/')[-1]}")
-            print(f"   👤 {author}: {content[:100]}")
-            print(f"   🔑 {kw_str}  |  📊 {cat}")
-            print(f"   💾 Saved to CSV  (total: {signals_saved})")
-
-            q.task_done()
-        except queue.Empty:
-            continue
-        except Exception as e:
-            log.error(f"Worker error: {e}")
+    out.close()
+    remembered.close()
 
 # ─────────────────────────────────────────────
 # RATE LIMITER
@@ -227,6 +392,7 @@ if __name__ == "__main__":
     """)
 
     ensure_csv()
+    load_seen()
 
     t = threading.Thread(target=worker, daemon=True)
     t.start()
@@ -243,8 +409,9 @@ if __name__ == "__main__":
             bot.gateway.run(auto_reconnect=True)
 
         except KeyboardInterrupt:
-            log.info("🛑 Stopped — total saved: " + str(signals_saved))
             q.put(None)
+            t.join(timeout=10)    # let the writer flush its last group
+            log.info("🛑 Stopped — total saved: " + str(signals_saved))
             break
 
         except Exception as e:
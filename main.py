@@ -2,12 +2,29 @@
 MarketPulse News Engine v3.0
 ━━━━━━━━━━━━━━━━━━━━━━━━━━━
 Architecture  : Producer → work_queue → Workers → result_queue → Drain
-Anti-block    : Circuit breaker (persisted), ETag/Last-Modified cache (persisted),
-                per-domain concurrency cap (semaphore), full UA+header profiles,
-                request jitter, Retry-After respect, instant-trip on 403/401/451
-Pipeline      : Workers start fetching the MOMENT first URL is queued
-Storage       : Incremental CSV writes, dedup by link
-Runs 24/7     : Auto-restart cycle with random wait between runs
+                (work_queue is per-domain ready-queue: token-bucket gated)
+Anti-block    : Circuit breaker (persisted, half-open probe + graded ramp-up),
+                ETag/Last-Modified + body-digest cache (persisted),
+                per-domain rate + concurrency learned by AIMD (persisted),
+                full UA+header profiles, request jitter, Retry-After respect,
+                instant-trip on 403/401/451
+Pipeline      : Workers start fetching the MOMENT first URL is queued;
+                bodies are parsed in a process pool (one per core), off the GIL
+Fetch modes   : "threads" (50 × SessionPage) or "async" (one asyncio loop, aiohttp)
+Storage       : SQLite (WAL, group commit) + optional CSV export,
+                dedup by canonical link (redirects unwrapped, tracking stripped;
+                on-disk SQLite fingerprint index),
+                near-duplicate headlines clustered into stories (MinHash/LSH)
+Runs 24/7     : Adaptive per-feed schedule (learned from yield, persisted),
+                or the classic full cycle with random wait between runs;
+                dead / duplicate-only feeds demoted and re-tested (feed health)
+Metrics       : Prometheus /metrics — per-stage latency histograms
+                (queue, limiter, semaphore, HTTP, parse, store, flush)
+                and per-domain 304 / 429 / 4xx counters;
+                SIGUSR1 → sampled collapsed stacks + lock contention
+Sharded mode  : `main.py coordinator` + N × `main.py node` — feeds split by
+                rendezvous hash of their domain, per-domain budget divided
+                among holders, dedup/storage on the coordinator
 """
 
 import feedparser
@@ -18,13 +35,43 @@ import random
 import os
 import logging
 import threading
-from queue import Queue
+import asyncio
+import heapq
+import itertools
+import re
+import sqlite3
+import xml.etree.ElementTree as ET
+import hashlib
+import gzip
+import zlib
+import base64
+import weakref
+import math
+import bisect
+import struct
+import socket
+import signal
+import sys
+import argparse
+import urllib.request
+import multiprocessing
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from abc import ABC, abstractmethod
+from queue import Queue, Empty
 from datetime import datetime, timezone
 from dataclasses import dataclass, asdict
-from collections import defaultdict
-from urllib.parse import urlparse
+from collections import defaultdict, deque, Counter
+from urllib.parse import urlparse, urlunparse, parse_qsl, parse_qs, quote_plus, unquote_plus
+from email.utils import parsedate_to_datetime
 from DrissionPage import SessionPage
 
+try:
+    import aiohttp          # only needed for fetch_mode="async"
+except ImportError:
+    aiohttp = None
+
 
 # ══════════════════════════════════════════════════════════════════════
 # LOGGING
@@ -40,6 +87,367 @@ logging.basicConfig(
 log = logging.getLogger("MarketPulse")
 
 
+# ══════════════════════════════════════════════════════════════════════
+# STATE FILES  (atomic JSON snapshots shared by the persisted components)
+# ══════════════════════════════════════════════════════════════════════
+def _atomic_write_json(path: str, obj) -> bool:
+    """tmp file + os.replace, so a crash mid-write never leaves half a file."""
+    try:
+        tmp = path + ".tmp"
+        with open(tmp, "w") as f:
+            json.dump(obj, f)
+        os.replace(tmp, path)
+        return True
+    except Exception as e:
+        log.warning(f"State save error [{path}]: {e}")
+        return False
+
+
+def _read_json(path: str, default):
+    """Parsed file, or `default` when it is missing, unreadable or the wrong shape."""
+    if not os.path.exists(path):
+        return default
+    try:
+        with open(path) as f:
+            data = json.load(f)
+    except Exception as e:
+        log.warning(f"State load error [{path}]: {e}")
+        return default
+    if not isinstance(data, type(default)):
+        log.warning(f"State load error [{path}]: expected {type(default).__name__}")
+        return default
+    return data
+
+
+# ══════════════════════════════════════════════════════════════════════
+# MODULE 0 – METRICS  (stage histograms + counters, Prometheus text format)
+# ══════════════════════════════════════════════════════════════════════
+class Metrics:
+    """
+    In-process counters and histograms, served as Prometheus text on
+    GET /metrics (serve()). One registry for the whole engine, like `log`.
+
+    route() adds more GET endpoints on the same port (the profiler's
+    /debug/profile and /debug/locks).
+
+    Stages timed into marketpulse_stage_seconds{stage=…}:
+      enqueue   — producer put() into the work queue
+      queue     — parked in the work queue until a worker takes the feed
+      limiter   — part of `queue` spent waiting for the domain's token
+      semaphore — waiting for a per-domain connection slot
+      http      — request sent → response headers
+      parse     — body → NewsItems (fetch thread or parse process)
+      store     — drain: dedup + write of one feed's items
+      flush     — drain: group commit / cache + state flushes
+    plus marketpulse_responses_total{domain, status} with status one of
+    2xx, 304, 3xx, 429, 4xx, 5xx, error.
+    """
+    BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 300)
+    HELP = {
+        "marketpulse_stage_seconds":     ("histogram", "Time spent per pipeline stage"),
+        "marketpulse_responses_total":   ("counter",   "HTTP responses per domain and status class"),
+        "marketpulse_items_saved_total": ("counter",   "New items written to the warehouse"),
+    }
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters: dict = defaultdict(float)   # (name, labels) → value
+        self._hists:    dict = {}                   # (name, labels) → [bucket counts…, sum, count]
+        self._routes:   dict = {"/metrics": ("text/plain; version=0.0.4; charset=utf-8", lambda q: self.render())}
+        self.server = None
+
+    def route(self, path: str, fn, content_type: str = "text/plain; charset=utf-8"):
+        """GET `path` → fn(query dict) → response text."""
+        self._routes[path] = (content_type, fn)
+
+    @staticmethod
+    def _key(name: str, labels: dict) -> tuple:
+        return name, tuple(sorted(labels.items()))
+
+    def inc(self, name: str, value: float = 1, **labels):
+        with self._lock:
+            self._counters[self._key(name, labels)] += value
+
+    def observe(self, name: str, value: float, **labels):
+        i = bisect.bisect_left(self.BUCKETS, value)
+        with self._lock:
+            h = self._hists.get(self._key(name, labels))
+            if h is None:
+                h = self._hists[self._key(name, labels)] = [0] * (len(self.BUCKETS) + 3)
+            h[i] += 1                    # index len(BUCKETS) is the +Inf overflow
+            h[-2] += value
+            h[-1] += 1
+
+    def stage(self, stage: str, seconds: float):
+        self.observe("marketpulse_stage_seconds", seconds, stage=stage)
+
+    def response(self, domain: str, status: int):
+        if status == 0:
+            cls = "error"
+        elif status in (304, 429):
+            cls = str(status)
+        else:
+            cls = f"{status // 100}xx"
+        self.inc("marketpulse_responses_total", domain=domain, status=cls)
+
+    def snapshot(self) -> tuple:
+        """→ ({(name, labels): value} counters, {(name, labels): (count, sum)} histograms)."""
+        with self._lock:
+            counters = dict(self._counters)
+            hists    = {k: (h[-1], h[-2]) for k, h in self._hists.items()}
+        return counters, hists
+
+    @staticmethod
+    def _labels(labels: tuple) -> str:
+        if not labels:
+            return ""
+        escape = lambda v: str(v).replace("\\", "\\\\").replace('"', '\\"')
+        return "{" + ",".join(f'{k}="{escape(v)}"' for k, v in labels) + "}"
+
+    def render(self) -> str:
+        with self._lock:
+            counters = sorted(self._counters.items())
+            hists    = sorted((k, list(v)) for k, v in self._hists.items())
+        lines, typed = [], set()
+
+        def header(name):
+            if name not in typed:
+                typed.add(name)
+                kind, text = self.HELP.get(name, ("untyped", name))
+                lines.append(f"# HELP {name} {text}")
+                lines.append(f"# TYPE {name} {kind}")
+
+        for (name, labels), value in counters:
+            header(name)
+            lines.append(f"{name}{self._labels(labels)} {value:g}")
+        for (name, labels), h in hists:
+            header(name)
+            cumulative = 0
+            for bound, n in zip(self.BUCKETS + ("+Inf",), h):
+                cumulative += n
+                lines.append(f"{name}_bucket{self._labels(labels + (('le', bound),))} {cumulative}")
+            lines.append(f"{name}_sum{self._labels(labels)} {h[-2]:.6f}")
+            lines.append(f"{name}_count{self._labels(labels)} {h[-1]}")
+        return "\n".join(lines) + "\n"
+
+    def serve(self, port: int, host: str = "127.0.0.1"):
+        """Expose GET /metrics on a daemon thread; a busy port is logged, not fatal."""
+        registry = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                path, _, query = self.path.partition("?")
+                route = registry._routes.get(path)
+                if route is None:
+                    self.send_response(404)
+                    self.end_headers()
+                    return
+                content_type, fn = route
+                data = fn(parse_qs(query)).encode()
+                self.send_response(200)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+        try:
+            self.server = ThreadingHTTPServer((host, port), Handler)
+        except OSError as exc:
+            log.warning(f"📊 Metrics endpoint not started on {host}:{port}: {exc}")
+            return
+        self.server.daemon_threads = True
+        threading.Thread(target=self.server.serve_forever, daemon=True, name="Metrics").start()
+        log.info(f"📊 Metrics on http://{host}:{self.server.server_address[1]}/metrics")
+
+
+metrics = Metrics()
+
+
+# ══════════════════════════════════════════════════════════════════════
+# MODULE 0a – PROFILER  (on-demand stack sampling + lock contention)
+# ══════════════════════════════════════════════════════════════════════
+class ContendedLock:
+    """
+    threading.Lock that counts how often, and how long, callers had to
+    wait for it. The uncontended path is one non-blocking acquire; the
+    counters are only touched while the lock is held. Locks sharing a
+    `name` (one per token bucket, say) are reported together. Only live
+    locks are tracked — the ready queue builds fresh ones every cycle.
+    """
+    _registry: "weakref.WeakSet" = weakref.WeakSet()
+
+    def __init__(self, name: str):
+        self.name       = name
+        self._lock      = threading.Lock()
+        self.acquired   = 0
+        self.contended  = 0
+        self.wait_total = 0.0
+        self.wait_max   = 0.0
+        ContendedLock._registry.add(self)
+
+    def acquire(self, blocking: bool = True, timeout: float = -1) -> bool:
+        if self._lock.acquire(False):
+            self.acquired += 1
+            return True
+        if not blocking:
+            return False
+        started = time.perf_counter()
+        if not self._lock.acquire(True, timeout):
+            return False
+        waited = time.perf_counter() - started
+        self.acquired   += 1
+        self.contended  += 1
+        self.wait_total += waited
+        self.wait_max    = max(self.wait_max, waited)
+        return True
+
+    def release(self):
+        self._lock.release()
+
+    def locked(self) -> bool:
+        return self._lock.locked()
+
+    def __enter__(self):
+        self.acquire()
+        return self
+
+    def __exit__(self, *exc):
+        self._lock.release()
+
+    @classmethod
+    def snapshot(cls) -> dict:
+        """name → [acquired, contended, wait seconds, max wait seconds, instances]."""
+        totals: dict = {}
+        for lock in list(cls._registry):
+            t = totals.setdefault(lock.name, [0, 0, 0.0, 0.0, 0])
+            t[0] += lock.acquired
+            t[1] += lock.contended
+            t[2] += lock.wait_total
+            t[3]  = max(t[3], lock.wait_max)
+            t[4] += 1
+        return totals
+
+    @classmethod
+    def report(cls, since: dict = None) -> str:
+        """Contention table, optionally only what happened after the `since` snapshot."""
+        lines = [f"{'lock':<14} {'n':>4} {'acquired':>12} {'contended':>10} {'%':>6} {'wait s':>10} {'max ms':>9}"]
+        for name, (acq, cont, wait, peak, n) in sorted(cls.snapshot().items()):
+            if since and name in since:
+                # Locks collected since `since` take their counts with them — clamp at 0
+                acq  = max(0, acq - since[name][0])
+                cont = max(0, cont - since[name][1])
+                wait = max(0.0, wait - since[name][2])
+            pct = 100.0 * cont / acq if acq else 0.0
+            lines.append(f"{name:<14} {n:>4} {acq:>12,} {cont:>10,} {pct:>5.1f}% {wait:>10.3f} {peak * 1000:>9.2f}")
+        return "\n".join(lines) + "\n"
+
+
+class SamplingProfiler:
+    """
+    Wall-clock sampler for a running engine: every `interval` seconds it
+    walks sys._current_frames() for all threads and counts each stack in
+    collapsed form — "Worker;main.py:fetch_once;…;ssl.py:read 42" — ready
+    for flamegraph.pl / speedscope. Worker-7 and Worker-12 are merged as
+    "Worker". Nothing runs until a profile is asked for:
+
+      kill -USR1 <pid>                          → PROFILE_SECONDS, written to PROFILE_DIR
+      GET /debug/profile?seconds=N  (metrics)   → same (N clamped to 1–120), stacks in the response
+      GET /debug/locks              (metrics)   → ContendedLock table since start
+
+    Each profile also writes the lock-contention table for its window.
+    """
+    PROFILE_SECONDS = 30
+    MIN_SECONDS     = 1         # /debug/profile?seconds= is clamped to this range
+    MAX_SECONDS     = 120
+    INTERVAL        = 0.01
+    PROFILE_DIR     = "profiles"
+    _THREAD_NUM     = re.compile(r"([-_]\d+)+$")
+
+    def __init__(self):
+        self._running = threading.Lock()
+
+    def install(self, registry: "Metrics" = None):
+        """SIGUSR1 handler (main thread, POSIX only) + debug routes on the metrics port."""
+        if hasattr(signal, "SIGUSR1") and threading.current_thread() is threading.main_thread():
+            signal.signal(signal.SIGUSR1, lambda signum, frame: self.start())
+        if registry is not None:
+            registry.route("/debug/profile", self._http_profile)
+            registry.route("/debug/locks", lambda q: ContendedLock.report())
+
+    def start(self, seconds: float = None) -> bool:
+        """Profile in the background; False if a profile is already running."""
+        if not self._running.acquire(False):
+            log.warning("🔬 Profile already running")
+            return False
+        threading.Thread(
+            target=self._run, args=(seconds or self.PROFILE_SECONDS,), daemon=True, name="Profiler"
+        ).start()
+        return True
+
+    def _http_profile(self, query: dict) -> str:
+        try:
+            seconds = float(query.get("seconds", [self.PROFILE_SECONDS])[0])
+        except ValueError:
+            return "seconds must be a number\n"
+        if not math.isfinite(seconds):
+            return "seconds must be a number\n"
+        seconds = min(max(seconds, self.MIN_SECONDS), self.MAX_SECONDS)
+        if not self._running.acquire(False):
+            return "profile already running\n"
+        return self._run(seconds)
+
+    def _run(self, seconds: float) -> str:
+        """Caller holds self._running."""
+        try:
+            log.info(f"🔬 Profiling all threads for {seconds:.0f}s…")
+            locks_before = ContendedLock.snapshot()
+            stacks, samples = self.sample(seconds)
+            collapsed = "".join(f"{stack} {n}\n" for stack, n in stacks.most_common())
+            locks = ContendedLock.report(since=locks_before)
+
+            os.makedirs(self.PROFILE_DIR, exist_ok=True)
+            stamp = datetime.now(timezone.utc).strftime("%Y%m%d-%H%M%S")
+            path  = os.path.join(self.PROFILE_DIR, f"profile-{stamp}.collapsed")
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(collapsed)
+            with open(os.path.join(self.PROFILE_DIR, f"locks-{stamp}.txt"), "w", encoding="utf-8") as f:
+                f.write(locks)
+            log.info(f"🔬 Profile done: {samples:,} samples, {len(stacks):,} stacks → {path}")
+            for line in locks.splitlines():
+                log.info(f"   {line}")
+            return collapsed
+        finally:
+            self._running.release()
+
+    def sample(self, seconds: float) -> tuple:
+        """→ (Counter of collapsed stacks, number of sampling rounds)."""
+        stacks  = Counter()
+        me      = threading.get_ident()
+        rounds  = 0
+        deadline = time.monotonic() + seconds
+        while time.monotonic() < deadline:
+            names = {t.ident: self._THREAD_NUM.sub("", t.name) for t in threading.enumerate()}
+            for ident, frame in sys._current_frames().items():
+                if ident == me:
+                    continue
+                calls = []
+                while frame is not None:
+                    code = frame.f_code
+                    calls.append(f"{os.path.basename(code.co_filename)}:{code.co_name}")
+                    frame = frame.f_back
+                calls.append(names.get(ident, f"thread-{ident}"))
+                stacks[";".join(reversed(calls))] += 1
+            rounds += 1
+            time.sleep(self.INTERVAL)
+        return stacks, rounds
+
+
+profiler = SamplingProfiler()
+
+
 # ══════════════════════════════════════════════════════════════════════
 # MODULE 1 – DATA MODEL
 # ══════════════════════════════════════════════════════════════════════
@@ -51,15 +459,115 @@ class NewsItem:
     link:       str
     date:       str
     fetched_at: str = ""
+    cluster_id: str = ""  # same story across sources (StoryClusterer)
+    raw_link:   str = ""  # link exactly as the feed gave it; `link` is canonical
 
     def __post_init__(self):
         if not self.fetched_at:
             self.fetched_at = datetime.now(timezone.utc).isoformat()
 
 
+@dataclass
+class FetchJob:
+    """One feed on its way through the work queue; retry state travels with it."""
+    name:    str
+    url:     str
+    cat:     str
+    attempt: int   = 0
+    backoff: float = 1.5
+    probe:   bool  = False   # this job is its domain's half-open probe (CircuitBreaker.admit)
+
+    def retry(self) -> "FetchJob":
+        return FetchJob(self.name, self.url, self.cat, self.attempt + 1, self.backoff * 2, self.probe)
+
+
+@dataclass
+class FetchResult:
+    items:    list
+    retry_in: float = None   # seconds until the job should run again, None = finished
+    status:   int   = None   # HTTP status of the last attempt, 0 = network error, None = not fetched
+    latency:  float = None   # seconds to response headers
+    nbytes:   int   = 0      # body size (decoded characters)
+    body:     str   = None   # raw feed text still waiting for the parse stage
+
+
 # ══════════════════════════════════════════════════════════════════════
-# MODULE 2 – SOURCE MANAGER
+# MODULE 2 – SOURCE MANAGER  (+ multi-symbol feed batching)
 # ══════════════════════════════════════════════════════════════════════
+class FeedBatcher:
+    """
+    Folds per-symbol search feeds into combined OR / comma-list requests,
+    e.g. 480 `GNews-stock-{s}` feeds → 24 `GNews-stock-batchNN` feeds.
+
+    Remembers which symbols went into each batch so items coming back can
+    be attributed to the right ticker: a title mentioning one of the
+    batch's symbols gets `source = "{prefix}-{symbol}"`, exactly what the
+    per-symbol feed would have produced. Unmatched items keep the batch
+    name. 1–2 letter tickers (A, T, ON, IT…) only count in unambiguous
+    forms — `$T`, `(T)`, `NYSE: T` — since bare they are ordinary words.
+    """
+    ENTRIES_PER_SYMBOL = 5      # same depth the per-symbol feeds had
+    MAX_ENTRIES        = 100    # Google/Bing cap a result page around here
+
+    def __init__(self, batch_size: int = 20):
+        self.batch_size = max(1, batch_size)
+        self._batches: dict = {}    # feed name → (prefix, {alias: symbol}, compiled regex)
+
+    def feeds(self, prefix: str, template: str, cat: str, joiner: tuple, symbols: list) -> dict:
+        out = {}
+        if self.batch_size == 1:
+            for s in symbols:
+                out[f"{prefix}-{s}"] = (template.format(q=s), cat)
+            return out
+
+        opener, sep, closer = joiner
+        for i in range(0, len(symbols), self.batch_size):
+            group = symbols[i:i + self.batch_size]
+            name  = f"{prefix}-batch{i // self.batch_size:02d}"
+            query = opener + sep.join(group) + closer if len(group) > 1 else group[0]
+            out[name] = (template.format(q=query), cat)
+            self._batches[name] = (prefix, *self._matcher(group))
+        return out
+
+    @staticmethod
+    def _matcher(group: list) -> tuple:
+        aliases = {}
+        for sym in group:
+            aliases[sym] = sym
+            aliases[sym.replace("-", ".")] = sym        # BRK-B is written BRK.B in titles
+        ordered = sorted(aliases, key=len, reverse=True)
+        long_   = "|".join(re.escape(a) for a in ordered if len(a) > 2)
+        short   = "|".join(re.escape(a) for a in ordered if len(a) <= 2)
+        parts   = []
+        if long_:
+            parts.append(rf"(?<![\w$.])\$?({long_})(?![\w])")
+        if short:
+            parts.append(rf"(?:\$|\(|(?:NYSE|NASDAQ|Nasdaq|NYSEARCA):\s?)({short})(?![\w])")
+        return aliases, re.compile("|".join(parts))
+
+    def max_entries(self, name: str) -> int:
+        batch = self._batches.get(name)
+        if batch is None:
+            return self.ENTRIES_PER_SYMBOL
+        return min(self.MAX_ENTRIES, self.ENTRIES_PER_SYMBOL * len(set(batch[1].values())))
+
+    def attribute(self, name: str, items: list) -> list:
+        batch = self._batches.get(name)
+        if batch is None:
+            return items
+        prefix, aliases, pattern = batch
+        for item in items:
+            m = pattern.search(item.title)
+            if m:
+                alias = next(g for g in m.groups() if g)
+                item.source = f"{prefix}-{aliases[alias]}"
+        return items
+
+    def stats(self) -> str:
+        symbols = sum(len(set(b[1].values())) for b in self._batches.values())
+        return f"{symbols:,} symbols in {len(self._batches):,} batched feeds"
+
+
 class SourceManager:
     """Generates RSS URLs at runtime across stocks, crypto, macro and sentiment."""
 
@@ -214,25 +722,41 @@ class SourceManager:
         "recession outlook", "central bank", "quantitative easing",
     ]
 
+    # Providers whose search endpoint takes several symbols in one request.
+    # feed prefix → (URL template with {q}, news_type, (open, separator, close))
+    BATCHABLE = {
+        "GNews-stock":  ("https://news.google.com/rss/search?q={q}+stock+NYSE+NASDAQ&hl=en-US&gl=US&ceid=US:en", "Stock",  ("%28", "+OR+", "%29")),
+        "Finviz":       ("https://finviz.com/rss.ashx?t={q}",                                                     "Stock",  ("",    ",",    "")),
+        "Bing-stock":   ("https://www.bing.com/news/search?q={q}+stock&format=rss",                               "Stock",  ("%28", "+OR+", "%29")),
+        "GNews-crypto": ("https://news.google.com/rss/search?q={q}+cryptocurrency&hl=en-US&gl=US&ceid=US:en",     "Crypto", ("%28", "+OR+", "%29")),
+        "Bing-crypto":  ("https://www.bing.com/news/search?q={q}+crypto&format=rss",                              "Crypto", ("%28", "+OR+", "%29")),
+    }
+
+    def __init__(self, batch_size: int = 20):
+        """`batch_size` symbols per combined request; 1 = one feed per symbol (legacy)."""
+        self.batcher = FeedBatcher(batch_size)
+
     def get_all_feeds(self) -> dict:
         master = {}
         master.update(self.STATIC_FEEDS)
 
         tickers = list(dict.fromkeys(self.SP500))
         coins   = list(dict.fromkeys(self.CRYPTO))
+        stocks  = [t.replace(".", "-") for t in tickers]
 
-        for t in tickers:
-            s = t.replace(".", "-")
-            master[f"GNews-stock-{s}"]  = (f"https://news.google.com/rss/search?q={s}+stock+NYSE+NASDAQ&hl=en-US&gl=US&ceid=US:en", "Stock")
-            master[f"Finviz-{s}"]       = (f"https://finviz.com/rss.ashx?t={s}",                                                    "Stock")
-            master[f"Bing-stock-{s}"]   = (f"https://www.bing.com/news/search?q={s}+stock&format=rss",                              "Stock")
+        for prefix in ("GNews-stock", "Finviz", "Bing-stock"):
+            master.update(self.batcher.feeds(prefix, *self.BATCHABLE[prefix], stocks))
+
+        # Single-symbol endpoints — no multi-symbol form
+        for s in stocks:
             master[f"Nasdaq-{s}"]       = (f"https://www.nasdaq.com/feed/rssoutbound?symbol={s}",                                   "Stock")
             master[f"MarketBeat-{s}"]   = (f"https://www.marketbeat.com/stock-ideas/rss/?symbol={s}",                              "Stock")
 
+        for prefix in ("GNews-crypto", "Bing-crypto"):
+            master.update(self.batcher.feeds(prefix, *self.BATCHABLE[prefix], coins))
+
         for c in coins:
             cl = c.lower()
-            master[f"GNews-crypto-{c}"] = (f"https://news.google.com/rss/search?q={c}+cryptocurrency&hl=en-US&gl=US&ceid=US:en",   "Crypto")
-            master[f"Bing-crypto-{c}"]  = (f"https://www.bing.com/news/search?q={c}+crypto&format=rss",                            "Crypto")
             master[f"CTel-{c}"]         = (f"https://cointelegraph.com/rss/tag/{cl}",                                              "Crypto")
             master[f"CSlate-{c}"]       = (f"https://cryptoslate.com/feed/?s={cl}",                                                "Crypto")
 
@@ -244,120 +768,668 @@ class SourceManager:
             label = "Macro-" + term.replace(" ", "_")[:28]
             master[label] = (f"https://news.google.com/rss/search?q={slug}&hl=en-US&gl=US&ceid=US:en", "Macro")
 
-        log.info(f"SourceManager: {len(master):,} feeds generated.")
+        log.info(f"SourceManager: {len(master):,} feeds generated ({self.batcher.stats()}).")
         return master
 
+    # Publisher feed endpoints — these list newest first
+    NEWEST_FIRST = re.compile(r"(/feeds?\b|/rss|\.rss\b|\.xml\b|rss\.ashx|outboundfeeds|output=atom)", re.I)
+    # Aggregators whose feeds are ranked (hot / relevance / curated), even under /rss
+    RANKED_HOSTS = ("reddit.com", "news.google.com", "bing.com")
+
+    @classmethod
+    def chronological(cls, url: str) -> bool:
+        """
+        Safe to stop parsing at already-stored links? Only for feed types on
+        the NEWEST_FIRST allow-list; search results, Reddit listings and
+        Google News topics are ranked, so a seen entry there proves nothing.
+        """
+        host = urlparse(url).netloc.lower()
+        if any(host == h or host.endswith("." + h) for h in cls.RANKED_HOSTS):
+            return False
+        if "/search" in url or "?s=" in url:
+            return False
+        return bool(cls.NEWEST_FIRST.search(url))
+
+    # Delegates so the engine only talks to SourceManager
+    def max_entries(self, name: str) -> int:
+        return self.batcher.max_entries(name)
+
+    def attribute(self, name: str, items: list) -> list:
+        return self.batcher.attribute(name, items)
+
+
+# ══════════════════════════════════════════════════════════════════════
+# MODULE 2b – FEED SCHEDULER  (adaptive per-feed polling, persisted)
+# ══════════════════════════════════════════════════════════════════════
+class FeedScheduler:
+    """
+    Gives every feed its own next-due time instead of refetching all of
+    them each cycle.
+
+    Each feed keeps an EWMA of new links per second. Its interval is the
+    time that rate needs to produce TARGET_YIELD new links, clamped to the
+    floor/ceiling of its news_type — hot feeds (Reddit WSB) converge on the
+    floor, dead ones (retired Reuters) drift to the ceiling. Due times are
+    wall-clock and persisted, so a restart resumes the learned schedule.
+    """
+    STATE_FILE   = "feed_schedule.json"
+    TARGET_YIELD = 2.0     # new links we want to see per fetch
+    ALPHA        = 0.3     # EWMA weight of the latest observation
+
+    BOUNDS = {             # news_type → (floor, ceiling) in seconds
+        "Sentiment": (60,   1800),
+        "Crypto":    (90,   3600),
+        "Stock":     (120,  7200),
+        "Finance":   (120,  3600),
+        "Macro":     (300, 21600),
+    }
+    DEFAULT_BOUNDS = (120, 3600)
+
+    def __init__(self):
+        self._feeds:    dict = {}    # name → {"cat", "interval", "next_due", "rate", "last"}
+        self._inflight: set  = set()
+        self._lock  = threading.Lock()
+        self._load()
+
+    def _load(self):
+        self._feeds = _read_json(self.STATE_FILE, {})
+        if self._feeds:
+            log.info(f"FeedScheduler: {len(self._feeds):,} feed schedules restored")
+
+    def save(self):
+        with self._lock:
+            snapshot = {name: dict(rec) for name, rec in self._feeds.items()}
+        _atomic_write_json(self.STATE_FILE, snapshot)
+
+    def _bounds(self, cat: str) -> tuple:
+        return self.BOUNDS.get(cat, self.DEFAULT_BOUNDS)
+
+    def sync(self, feeds: dict):
+        """Register new feeds (due immediately) and forget ones no longer generated."""
+        now = time.time()
+        with self._lock:
+            for name, (_, cat) in feeds.items():
+                state = self._feeds.get(name)
+                if state is None:
+                    floor, ceiling = self._bounds(cat)
+                    interval = min(ceiling, floor * 2)
+                    self._feeds[name] = {
+                        "cat": cat, "interval": interval, "next_due": now,
+                        # Prior consistent with the starting interval, so one
+                        # empty fetch stretches it gradually, not to the ceiling
+                        "rate": self.TARGET_YIELD / interval, "last": None,
+                    }
+                else:
+                    state["cat"] = cat
+            for name in [n for n in self._feeds if n not in feeds]:
+                del self._feeds[name]
+
+    def pop_due(self) -> list:
+        """Names of feeds due now; they stay in flight until record()/postpone()."""
+        now = time.time()
+        with self._lock:
+            due = [
+                name for name, st in self._feeds.items()
+                if st["next_due"] <= now and name not in self._inflight
+            ]
+            self._inflight.update(due)
+            due.sort(key=lambda n: self._feeds[n]["next_due"])   # most overdue first
+        return due
+
+    def record(self, name: str, new_links: int):
+        """Feed finished with `new_links` unseen links → learn and reschedule."""
+        now = time.time()
+        with self._lock:
+            self._inflight.discard(name)
+            st = self._feeds.get(name)
+            if st is None:
+                return
+            floor, ceiling = self._bounds(st["cat"])
+            if st["last"] is not None:
+                # First observation is skipped — it includes the feed's whole backlog
+                sample = new_links / max(1.0, now - st["last"])
+                st["rate"] = self.ALPHA * sample + (1 - self.ALPHA) * st["rate"]
+                interval = self.TARGET_YIELD / st["rate"] if st["rate"] > 0 else ceiling
+                st["interval"] = min(ceiling, max(floor, interval))
+            st["last"]     = now
+            st["next_due"] = now + st["interval"] * random.uniform(0.9, 1.1)
+
+    def postpone(self, name: str, seconds: float):
+        """Put a due feed back without learning from it (e.g. its circuit is open)."""
+        with self._lock:
+            self._inflight.discard(name)
+            if name in self._feeds:
+                self._feeds[name]["next_due"] = time.time() + seconds
+
+    def floor(self, name: str) -> float:
+        st = self._feeds.get(name)
+        return self._bounds(st["cat"] if st else "")[0]
+
+    def seconds_until_next(self) -> float:
+        now = time.time()
+        with self._lock:
+            pending = [
+                st["next_due"] for name, st in self._feeds.items()
+                if name not in self._inflight
+            ]
+        return max(0.0, min(pending) - now) if pending else float("inf")
+
+    def stats(self) -> str:
+        with self._lock:
+            intervals = sorted(st["interval"] for st in self._feeds.values())
+        if not intervals:
+            return "feeds=0"
+        per_hour = sum(3600 / i for i in intervals)
+        return (
+            f"feeds={len(intervals):,}, ~{per_hour:,.0f} req/h, "
+            f"median interval={intervals[len(intervals) // 2]:.0f}s"
+        )
+
+
+# ══════════════════════════════════════════════════════════════════════
+# MODULE 2c – FEED HEALTH  (demote / quarantine / retire dead feeds, persisted)
+# ══════════════════════════════════════════════════════════════════════
+class FeedHealth:
+    """
+    Per-feed health record: recent status codes, latency, body size and an
+    EWMA of new items per fetch.
+
+      active      — fetched normally
+      demoted     — ≥ MIN_FETCHES fetches and yield below YIELD_FLOOR: the
+                    feed only produces duplicates, re-tested every few hours
+      quarantined — FAIL_STREAK errors / empty responses in a row
+                    (retired Reuters endpoints), re-tested daily
+      retired     — still failing after RETIRE_AFTER quarantine re-tests,
+                    re-tested weekly
+
+    Any fetch that yields a new item puts the feed straight back to active.
+    should_fetch() is the gate the producers use; a held-back feed's
+    re-test is claimed by the call that lets it through. Persisted to
+    `feed_health.json`.
+    """
+    STATE_FILE   = "feed_health.json"
+    HISTORY      = 10        # status codes kept per feed
+    ALPHA        = 0.1       # EWMA weight for yield / latency / size
+    MIN_FETCHES  = 20
+    YIELD_FLOOR  = 0.02      # new items per fetch
+    FAIL_STREAK  = 5
+    RETIRE_AFTER = 3
+    RETEST = {               # status → seconds between re-tests
+        "demoted":     3 * 3600,
+        "quarantined": 24 * 3600,
+        "retired":     7 * 24 * 3600,
+    }
+
+    def __init__(self):
+        self._feeds: dict = {}   # name → record, see _record()
+        self._lock = threading.Lock()
+        self._load()
+
+    def _load(self):
+        self._feeds = _read_json(self.STATE_FILE, {})
+        if self._feeds:
+            log.info(f"FeedHealth: {len(self._feeds):,} feed records restored — {self.stats()}")
+
+    def save(self):
+        with self._lock:
+            snapshot = {name: {**rec, "history": list(rec["history"])} for name, rec in self._feeds.items()}
+        _atomic_write_json(self.STATE_FILE, snapshot)
+
+    @staticmethod
+    def _record() -> dict:
+        return {
+            "status": "active", "history": [], "fetches": 0, "yield": None,
+            "latency": None, "bytes": None, "fail_streak": 0, "retests": 0,
+            "next_test": 0.0,
+        }
+
+    def sync(self, feeds: dict):
+        """Forget feeds no longer generated (new ones start active on first fetch)."""
+        with self._lock:
+            for name in [n for n in self._feeds if n not in feeds]:
+                del self._feeds[name]
+
+    def status(self, name: str) -> str:
+        st = self._feeds.get(name)
+        return st["status"] if st else "active"
+
+    def should_fetch(self, name: str) -> bool:
+        """True for active feeds and for held-back feeds whose re-test is due (claims it)."""
+        now = time.time()
+        with self._lock:
+            st = self._feeds.get(name)
+            if st is None or st["status"] == "active":
+                return True
+            if now < st["next_test"]:
+                return False
+            st["next_test"] = now + self.RETEST[st["status"]]
+            return True
+
+    def retest_in(self, name: str) -> float:
+        """Seconds until a held-back feed's next re-test (0 if it may go now)."""
+        st = self._feeds.get(name)
+        return max(0.0, st["next_test"] - time.time()) if st else 0.0
+
+    def _set(self, name: str, st: dict, status: str, why: str):
+        """Caller holds the lock."""
+        if st["status"] == status:
+            return
+        st["status"] = status
+        if status == "active":
+            st["retests"] = 0
+            log.info(f"  ♥ {name} back to active ({why})")
+        else:
+            st["next_test"] = time.time() + self.RETEST[status]
+            log.info(f"  ♥ {name} {status} ({why})")
+
+    def _ewma(self, old, sample: float) -> float:
+        return sample if old is None else self.ALPHA * sample + (1 - self.ALPHA) * old
+
+    def record(self, name: str, result: FetchResult, new_items: int):
+        """Learn from one finished fetch; `new_items` = rows actually stored."""
+        if result.status is None:
+            return                                   # never went out (circuit open)
+        ok = result.status in (200, 304)
+        with self._lock:
+            st = self._feeds.get(name)
+            if st is None:
+                st = self._feeds[name] = self._record()
+            held = st["status"] != "active"
+            st["fetches"] += 1
+            st["history"]  = (st["history"] + [result.status])[-self.HISTORY:]
+            if result.latency is not None:
+                st["latency"] = self._ewma(st["latency"], result.latency)
+            if result.nbytes:
+                st["bytes"] = self._ewma(st["bytes"], result.nbytes)
+            if ok:
+                st["yield"] = self._ewma(st["yield"], new_items)
+
+            if new_items:
+                st["fail_streak"] = 0
+                self._set(name, st, "active", f"+{new_items} new")
+            elif not ok or (result.status == 200 and not result.nbytes):
+                st["fail_streak"] += 1
+                if st["status"] == "quarantined" and held:
+                    st["retests"] += 1
+                    if st["retests"] >= self.RETIRE_AFTER:
+                        self._set(name, st, "retired", f"{st['retests']} failed re-tests")
+                elif st["status"] in ("active", "demoted") and st["fail_streak"] >= self.FAIL_STREAK:
+                    self._set(name, st, "quarantined", f"{st['fail_streak']} failures, last HTTP {result.status}")
+            else:
+                st["fail_streak"] = 0
+                if st["status"] in ("quarantined", "retired"):
+                    self._set(name, st, "demoted", f"responding again, HTTP {result.status}")
+                elif (
+                    st["status"] == "active" and st["fetches"] >= self.MIN_FETCHES
+                    and st["yield"] < self.YIELD_FLOOR
+                ):
+                    self._set(name, st, "demoted", f"yield {st['yield']:.3f}/fetch")
+
+    def snapshot(self, name: str) -> dict:
+        with self._lock:
+            return dict(self._feeds.get(name) or self._record())
+
+    def stats(self) -> str:
+        counts = defaultdict(int)
+        with self._lock:
+            for st in self._feeds.values():
+                counts[st["status"]] += 1
+        return ", ".join(f"{k}={counts[k]:,}" for k in ("active", "demoted", "quarantined", "retired"))
+
 
 # ══════════════════════════════════════════════════════════════════════
-# MODULE 3 – CIRCUIT BREAKER  (persisted to disk)
+# MODULE 3 – CIRCUIT BREAKER  (write-behind persistence)
 # ══════════════════════════════════════════════════════════════════════
 class CircuitBreaker:
     """
     Per-domain failure tracker. After `threshold` failures the domain
-    enters a cooldown for `cooldown` seconds. State is persisted to disk
-    so bans survive script restarts. 403/401/451 instantly trip the breaker.
+    enters a cooldown for `cooldown` seconds. 403/401/451 instantly trip
+    the breaker.
+
+    Recovery is graded instead of all-at-once:
+      open       — cooling down, every request skipped
+      half_open  — cooldown over; the next admit() call is let through
+                   as the single probe, everyone else is still skipped
+      probing    — probe in flight (reverts to half_open after PROBE_TIMEOUT)
+      recovering — probe succeeded; the domain runs at `ramp` (RAMP_START of
+                   its normal rate and concurrency), doubling every
+                   RAMP_STEP successes until it is closed again
+    A failed probe or any failure while recovering re-opens the circuit,
+    each consecutive time with a doubled cooldown (capped at MAX_COOLDOWN).
+    Ramp changes are pushed to listeners (limiter / worker-pool gates).
+
+    State is persisted write-behind: the hot path only mutates dicts and
+    sets a dirty flag, and a background thread writes `circuit_state.json`
+    (tmp file + os.replace) at most every FLUSH_EVERY seconds. Trips are
+    stored as wall-clock expiry times, so after a restart — or a reboot —
+    bans that are still valid are restored and expired ones are dropped.
     """
-    STATE_FILE = "circuit_state.json"
-    PERM_BLOCK = {403, 401, 451}
+    STATE_FILE    = "circuit_state.json"
+    PERM_BLOCK    = {403, 401, 451}
+    NETWORK_ERROR = 0          # record_failure() code for timeouts / connection resets
+    FLUSH_EVERY   = 1.0
+    PROBE_TIMEOUT = 120.0
+    RAMP_START    = 0.25
+    RAMP_STEP     = 5          # successes per ramp doubling
+    MAX_COOLDOWN  = 6 * 3600
 
     def __init__(self, threshold: int = 3, cooldown: int = 1800):
         self._threshold = threshold
         self._cooldown  = cooldown
         self._failures: dict = defaultdict(int)
-        self._tripped:  dict = {}   # domain → monotonic timestamp of trip
-        self._lock = threading.Lock()
+        self._tripped:  dict = {}   # domain → wall-clock (time.time()) expiry of the ban
+        self._strikes:  dict = {}   # domain → consecutive re-trips (cooldown doubling)
+        self._ramp:     dict = {}   # domain → [level, successes at this level]
+        self._probes:   dict = {}   # domain → monotonic start of the in-flight probe
+        self._listeners: list = []
+        self._lock  = ContendedLock("circuit")
+        self._dirty = threading.Event()
         self._load()
+        threading.Thread(target=self._flush_loop, daemon=True, name="CircuitFlush").start()
 
     def _load(self):
-        if os.path.exists(self.STATE_FILE):
+        data = _read_json(self.STATE_FILE, {})
+        if not data:
+            return
+        now = time.time()
+        # Legacy files hold monotonic trip stamps — as wall-clock expiries
+        # they lie in 1970, so they are dropped like any expired ban
+        self._tripped  = {d: float(t) for d, t in data.get("tripped", {}).items() if float(t) > now}
+        self._failures = defaultdict(int, data.get("failures", {}))
+        self._strikes  = data.get("strikes", {})
+        self._ramp     = {d: [lvl, 0] for d, lvl in data.get("ramp", {}).items()}
+        for domain in data.get("tripped", {}):
+            if domain not in self._tripped:
+                self._failures[domain] = 0
+        log.info(f"CircuitBreaker: {len(self._tripped)} domain(s) in cooldown")
+
+    def _save(self):
+        # Flat dicts of numbers: shallow copies under the lock, serialise outside it
+        with self._lock:
+            state = {
+                "tripped":  dict(self._tripped),
+                "failures": dict(self._failures),
+                "strikes":  dict(self._strikes),
+                "ramp":     {d: r[0] for d, r in self._ramp.items()},
+            }
+        _atomic_write_json(self.STATE_FILE, state)
+
+    def _flush_loop(self):
+        while True:
+            self._dirty.wait()
+            time.sleep(self.FLUSH_EVERY)     # coalesce a burst of changes into one write
+            self._dirty.clear()
+            self._save()
+
+    def flush(self):
+        """Synchronous save — end of cycle / shutdown."""
+        if self._dirty.is_set():
+            self._dirty.clear()
+            self._save()
+
+    # ── ramp listeners ────────────────────────────────────────────────
+    def add_listener(self, fn):
+        """fn(domain, level) is called whenever a domain's ramp level changes."""
+        self._listeners.append(fn)
+        with self._lock:
+            current = [(d, r[0]) for d, r in self._ramp.items()]
+        for domain, level in current:      # restored ramps apply immediately
+            fn(domain, level)
+
+    def _notify(self, domain: str, level: float):
+        for fn in self._listeners:
             try:
-                with open(self.STATE_FILE) as f:
-                    data = json.load(f)
-                self._tripped  = data.get("tripped", {})
-                self._failures = defaultdict(int, data.get("failures", {}))
-                log.info(f"CircuitBreaker: {len(self._tripped)} domain(s) in cooldown")
+                fn(domain, level)
             except Exception as e:
-                log.warning(f"CircuitBreaker load error: {e}")
+                log.warning(f"CircuitBreaker listener error: {e}")
 
-    def _save(self):
-        try:
-            with open(self.STATE_FILE, "w") as f:
-                json.dump(
-                    {"tripped": self._tripped, "failures": dict(self._failures)},
-                    f, indent=2
-                )
-        except Exception as e:
-            log.warning(f"CircuitBreaker save error: {e}")
+    # ── state ─────────────────────────────────────────────────────────
+    def _state(self, domain: str) -> str:
+        """Caller holds the lock."""
+        if domain in self._tripped:
+            if time.time() < self._tripped[domain]:
+                return "open"
+            started = self._probes.get(domain)
+            if started is not None and time.monotonic() - started < self.PROBE_TIMEOUT:
+                return "probing"
+            return "half_open"
+        return "recovering" if domain in self._ramp else "closed"
 
-    def is_open(self, domain: str) -> bool:
-        """True = skip this domain entirely."""
+    def state(self, domain: str) -> str:
+        """closed | open | half_open | probing | recovering — no side effects."""
         with self._lock:
-            if domain in self._tripped:
-                if time.monotonic() - float(self._tripped[domain]) < self._cooldown:
-                    return True
-                # cooldown expired → reset
-                del self._tripped[domain]
-                self._failures[domain] = 0
-                self._save()
-            return False
+            return self._state(domain)
+
+    def blocked(self, domain: str) -> bool:
+        """True while no request for `domain` would be let through."""
+        return self.state(domain) in ("open", "probing")
+
+    def retry_in(self, domain: str) -> float:
+        """Seconds until an open domain's cooldown ends (0 if not open)."""
+        with self._lock:
+            return max(0.0, self._tripped.get(domain, 0.0) - time.time())
+
+    def ramp(self, domain: str) -> float:
+        with self._lock:
+            return self._ramp[domain][0] if domain in self._ramp else 1.0
+
+    def admit(self, domain: str, holds_probe: bool = False) -> str:
+        """
+        Fetch-path gate, checked on every attempt → "go", "probe" or "skip".
+        A half-open domain lets exactly one caller through as "probe"; while
+        it is probing only that caller's retries (`holds_probe`) get through.
+        """
+        with self._lock:
+            state = self._state(domain)
+            if state in ("closed", "recovering"):
+                return "go"
+            if state == "half_open" or (state == "probing" and holds_probe):
+                if state == "half_open":
+                    log.info(f"  ⚡ Circuit half-open [{domain}] — sending probe")
+                self._probes[domain] = time.monotonic()
+                return "probe"
+            return "skip"
+
+    def is_open(self, domain: str) -> bool:
+        """True = skip. A half-open domain lets exactly one caller through."""
+        return self.admit(domain) == "skip"
+
+    def _trip(self, domain: str, strikes: int):
+        """Caller holds the lock."""
+        self._strikes[domain] = strikes
+        self._tripped[domain] = time.time() + min(self.MAX_COOLDOWN, self._cooldown * 2 ** strikes)
+        self._probes.pop(domain, None)
+        self._ramp.pop(domain, None)
 
     def record_failure(self, domain: str, code: int):
         with self._lock:
-            # Permanent-block codes count as `threshold` failures at once
-            inc = self._threshold if code in self.PERM_BLOCK else 1
-            self._failures[domain] += inc
-            if self._failures[domain] >= self._threshold:
-                self._tripped[domain] = time.monotonic()
+            state = self._state(domain)
+            if state in ("probing", "half_open", "recovering"):
+                # Probe or ramp failed → straight back to open, longer cooldown
+                strikes = self._strikes.get(domain, 0) + 1
+                self._trip(domain, strikes)
+                tripped, label = True, f"recovery failed, cooldown ×{2 ** strikes}"
+            else:
+                # Permanent-block codes count as `threshold` failures at once
+                inc = self._threshold if code in self.PERM_BLOCK else 1
+                self._failures[domain] += inc
+                tripped = self._failures[domain] >= self._threshold and state == "closed"
+                if tripped:
+                    self._trip(domain, 0)
                 label = "PERMANENT BLOCK" if code in self.PERM_BLOCK else "30-min cooldown"
-                log.warning(f"  ⚡ Circuit tripped [{domain}] HTTP {code} — {label}")
-                self._save()
+        self._dirty.set()
+        if tripped:
+            reason = f"HTTP {code}" if code != self.NETWORK_ERROR else "network error"
+            log.warning(f"  ⚡ Circuit tripped [{domain}] {reason} — {label}")
 
     def record_success(self, domain: str):
+        level = None
         with self._lock:
-            if self._failures.get(domain, 0) > 0:
+            state = self._state(domain)
+            if state in ("probing", "half_open"):
+                del self._tripped[domain]
+                self._probes.pop(domain, None)
+                self._failures[domain] = 0
+                self._ramp[domain] = [self.RAMP_START, 0]
+                level = self.RAMP_START
+                log.info(f"  ⚡ Probe OK [{domain}] — ramping up from {level:.0%}")
+            elif state == "recovering":
+                ramp = self._ramp[domain]
+                ramp[1] += 1
+                if ramp[1] < self.RAMP_STEP:
+                    return
+                ramp[0], ramp[1] = min(1.0, ramp[0] * 2), 0
+                level = ramp[0]
+                if level >= 1.0:
+                    del self._ramp[domain]
+                    self._strikes.pop(domain, None)
+                    log.info(f"  ⚡ Circuit closed [{domain}] — fully recovered")
+            elif self._failures.get(domain, 0) == 0:
+                return
+            else:
                 self._failures[domain] = 0
-                self._save()
+        self._dirty.set()
+        if level is not None:
+            self._notify(domain, level)
 
     def stats(self) -> str:
         with self._lock:
-            return f"tripped={len(self._tripped)}, tracked={len(self._failures)}"
+            return (
+                f"tripped={len(self._tripped)}, recovering={len(self._ramp)}, "
+                f"tracked={len(self._failures)}"
+            )
 
 
 # ══════════════════════════════════════════════════════════════════════
-# MODULE 4 – CONDITIONAL-GET CACHE  (persisted to disk)
+# MODULE 4 – CONDITIONAL-GET CACHE  (journaled to disk)
 # ══════════════════════════════════════════════════════════════════════
 class ConditionalGetCache:
     """
     Stores ETag + Last-Modified per URL. On repeat visits we send these
     headers back — server returns 304 Not Modified if nothing changed.
     Result: ~60-80% less bandwidth, and we look like a real RSS reader.
-    Flushed to disk every 50 updates and at end of each cycle.
+
+    Many feeds send neither header, so each URL also keeps a digest of its
+    last body with volatile bits (feed-level lastBuildDate / pubDate /
+    updated, comments, whitespace) stripped. An identical digest → skip
+    parse and storage entirely. Hit rates for both paths are reported by stats().
+
+    Persistence is journaled: an update only touches the dict and a pending
+    list under the lock. A background flusher appends pending updates to
+    `etag_cache.journal` every FLUSH_EVERY seconds; once the journal passes
+    COMPACT_AFTER lines it is folded into `etag_cache.json` via tmp-file +
+    os.replace and truncated. Replaying the journal over the snapshot is
+    idempotent, so a crash at any point loses at most one flush interval and
+    never leaves a half-written snapshot. Loading runs in the background;
+    the first lookup waits for it.
     """
-    CACHE_FILE = "etag_cache.json"
+    CACHE_FILE    = "etag_cache.json"
+    JOURNAL_FILE  = "etag_cache.journal"
+    FLUSH_EVERY   = 2.0        # seconds between journal appends
+    COMPACT_AFTER = 20_000     # journal lines before folding into the snapshot
+
+    # Feed-level stamps that change on every request without the content changing.
+    # Only stripped from the header (before the first item/entry) — item dates stay.
+    _HEAD_VOLATILE = re.compile(
+        r"<(lastBuildDate|pubDate|updated|dc:date)>[^<]*</\1>"
+    )
+    _FIRST_ENTRY = re.compile(r"<(?:item|entry)[\s>]")
+    _COMMENT     = re.compile(r"<!--.*?-->", re.S)
+    _SPACE       = re.compile(r"\s+")
 
     def __init__(self):
-        self._cache: dict = {}
-        self._lock  = threading.Lock()
-        self._dirty = 0
-        self._load()
+        self._cache: dict   = {}
+        self._pending: list = []          # (url, entry) not yet journaled
+        self._lock     = ContendedLock("etag_cache")  # dict + pending only — never held for I/O
+        self._io_lock  = threading.Lock() # serialises journal / snapshot writes
+        self._journal_lines = 0
+        self._not_modified  = 0           # 304s
+        self._unchanged     = 0           # 200s whose digest matched
+        self._changed       = 0           # 200s with new content
+        self._loaded   = threading.Event()
+        threading.Thread(target=self._load, daemon=True, name="ETagCacheLoad").start()
+        threading.Thread(target=self._flush_loop, daemon=True, name="ETagCacheFlush").start()
 
+    # ── persistence ───────────────────────────────────────────────────
     def _load(self):
-        if os.path.exists(self.CACHE_FILE):
-            try:
+        cache, replayed = {}, 0
+        try:
+            if os.path.exists(self.CACHE_FILE):
                 with open(self.CACHE_FILE) as f:
-                    self._cache = json.load(f)
-                log.info(f"ETagCache: {len(self._cache):,} entries loaded")
+                    cache = json.load(f)
+            if os.path.exists(self.JOURNAL_FILE):
+                with open(self.JOURNAL_FILE) as f:
+                    for line in f:
+                        try:
+                            url, entry = json.loads(line)
+                        except ValueError:
+                            continue          # torn last line from a crash
+                        cache[url] = entry
+                        replayed += 1
+            log.info(f"ETagCache: {len(cache):,} entries loaded ({replayed:,} journal updates replayed)")
+        except Exception as e:
+            log.warning(f"ETagCache load error: {e}")
+        with self._lock:
+            # Anything recorded while we were loading wins over disk state
+            cache.update(self._cache)
+            self._cache = cache
+            self._journal_lines = replayed
+        self._loaded.set()
+
+    def _ready(self):
+        if not self._loaded.is_set():
+            self._loaded.wait()
+
+    def _flush_loop(self):
+        self._loaded.wait()
+        while True:
+            time.sleep(self.FLUSH_EVERY)
+            self.flush()
+
+    def _append_journal(self, pending: list):
+        with open(self.JOURNAL_FILE, "a") as f:
+            f.write("".join(json.dumps([url, entry]) + "\n" for url, entry in pending))
+        self._journal_lines += len(pending)
+
+    def _compact(self):
+        with self._lock:
+            snapshot      = dict(self._cache)
+            pending       = self._pending
+            self._pending = []
+        if pending:
+            self._append_journal(pending)   # already in `snapshot`, keeps replay exact
+        tmp = self.CACHE_FILE + ".tmp"
+        with open(tmp, "w") as f:
+            json.dump(snapshot, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, self.CACHE_FILE)
+        open(self.JOURNAL_FILE, "w").close()   # only this thread writes the journal
+        self._journal_lines = 0
+
+    def flush(self):
+        """Append pending updates to the journal; compact when it grows large."""
+        self._ready()
+        with self._io_lock:
+            try:
+                if self._journal_lines >= self.COMPACT_AFTER:
+                    self._compact()
+                    return
+                with self._lock:
+                    pending, self._pending = self._pending, []
+                if pending:
+                    self._append_journal(pending)
             except Exception as e:
-                log.warning(f"ETagCache load error: {e}")
+                log.warning(f"ETagCache flush error: {e}")
 
-    def _save(self):
-        try:
-            with open(self.CACHE_FILE, "w") as f:
-                json.dump(self._cache, f)
-        except Exception as e:
-            log.warning(f"ETagCache save error: {e}")
+    def _record(self, url: str, entry: dict):
+        """Caller holds self._lock."""
+        self._cache[url] = entry
+        self._pending.append((url, entry))
 
+    # ── lookups / updates (hot path: dict ops only) ───────────────────
     def get_headers(self, url: str) -> dict:
+        self._ready()
         entry   = self._cache.get(url, {})
         headers = {}
         if "etag" in entry:
@@ -367,73 +1439,853 @@ class ConditionalGetCache:
         return headers
 
     def update(self, url: str, resp_headers: dict):
-        entry = {}
+        fresh = {}
         if "ETag" in resp_headers:
-            entry["etag"]          = resp_headers["ETag"]
+            fresh["etag"]          = resp_headers["ETag"]
         if "Last-Modified" in resp_headers:
-            entry["last_modified"] = resp_headers["Last-Modified"]
-        if not entry:
+            fresh["last_modified"] = resp_headers["Last-Modified"]
+        if not fresh:
             return
+        self._ready()
         with self._lock:
-            self._cache[url] = entry
-            self._dirty     += 1
-            if self._dirty >= 50:
-                self._save()
-                self._dirty = 0
+            digest = self._cache.get(url, {}).get("digest")
+            self._record(url, {**fresh, "digest": digest} if digest else fresh)
 
-    def flush(self):
+    def record_not_modified(self):
+        with self._lock:
+            self._not_modified += 1
+
+    @classmethod
+    def digest(cls, body: str) -> str:
+        first = cls._FIRST_ENTRY.search(body)
+        split = first.start() if first else len(body)
+        head  = cls._HEAD_VOLATILE.sub("", body[:split])
+        normalized = cls._SPACE.sub(" ", cls._COMMENT.sub("", head + body[split:]))
+        return hashlib.blake2b(normalized.encode("utf-8", "replace"), digest_size=16).hexdigest()
+
+    def body_unchanged(self, url: str, body: str) -> bool:
+        """True if `body` matches the last one seen for `url`; else remembers it."""
+        digest = self.digest(body)
+        self._ready()
         with self._lock:
-            if self._dirty:
-                self._save()
-                self._dirty = 0
+            entry = self._cache.get(url, {})
+            if entry.get("digest") == digest:
+                self._unchanged += 1
+                return True
+            self._changed += 1
+            self._record(url, {**entry, "digest": digest})
+        return False
+
+    def stats(self, reset: bool = False) -> str:
+        with self._lock:
+            n304, same, new = self._not_modified, self._unchanged, self._changed
+            if reset:
+                self._not_modified = self._unchanged = self._changed = 0
+        total = n304 + same + new
+        if not total:
+            return "no responses"
+        return (
+            f"304 {n304 / total:.0%} | body unchanged {same / total:.0%} | "
+            f"skipped {(n304 + same) / total:.0%} of {total:,}"
+        )
 
 
 # ══════════════════════════════════════════════════════════════════════
-# MODULE 5 – DOMAIN RATE LIMITER
+# MODULE 5 – DOMAIN RATE LIMITER  (token bucket per domain + ready-queue)
 # ══════════════════════════════════════════════════════════════════════
-class DomainLimiter:
-    """Max `rate` requests per `window` seconds per domain. Thread-safe."""
+class TokenBucket:
+    """Refills `rate` tokens/second up to `capacity`. One lock per bucket."""
 
-    def __init__(self, rate: float = 1.0, window: float = 2.0):
-        self._rate   = rate
-        self._window = window
-        self._counts: dict = defaultdict(list)
-        self._lock   = threading.Lock()
+    __slots__ = ("rate", "capacity", "tokens", "stamp", "lock")
 
-    @staticmethod
-    def _domain(url: str) -> str:
-        try:
+    def __init__(self, rate: float, capacity: float):
+        self.rate     = rate
+        self.capacity = capacity
+        self.tokens   = capacity
+        self.stamp    = time.monotonic()
+        self.lock     = ContendedLock("limiter.bucket")
+
+    def _refill(self, now: float):
+        self.tokens = min(self.capacity, self.tokens + (now - self.stamp) * self.rate)
+        self.stamp  = now
+
+    def wait_time(self, now: float) -> float:
+        """Seconds until a whole token is available (0.0 = right now)."""
+        with self.lock:
+            self._refill(now)
+            return max(0.0, (1.0 - self.tokens) / self.rate)
+
+    def try_take(self, now: float) -> float:
+        """Take a token if one is available → 0.0, else seconds to wait (nothing taken)."""
+        with self.lock:
+            self._refill(now)
+            if self.tokens >= 1.0:
+                self.tokens -= 1.0
+                return 0.0
+            return (1.0 - self.tokens) / self.rate
+
+    def take(self, now: float) -> float:
+        """Take a token unconditionally (may go into debt) → seconds until it's valid."""
+        with self.lock:
+            self._refill(now)
+            self.tokens -= 1.0
+            return max(0.0, -self.tokens / self.rate)
+
+    def set_rate(self, rate: float, now: float):
+        """Change the refill rate; tokens earned so far are kept."""
+        with self.lock:
+            self._refill(now)
+            self.rate = rate
+
+    def hold(self, seconds: float, now: float):
+        """No token for at least `seconds` (server said Retry-After)."""
+        with self.lock:
+            self._refill(now)
+            self.tokens = min(self.tokens, 1.0 - seconds * self.rate)
+
+
+class DomainLimiter:
+    """
+    Max `rate` requests per `window` seconds per domain, as a token bucket
+    per domain (burst = `burst`). Each bucket has its own lock and nobody
+    sleeps while holding one, so a throttled news.google.com never stalls
+    callers bound for other hosts. Thread-safe.
+
+    set_rate() overrides one domain's base rate (learned by DomainTuner),
+    set_scale() slows it down to a fraction of that (circuit-breaker
+    recovery ramp), set_share() to this node's part of a domain split
+    across shards; hold() empties its bucket for a Retry-After period.
+    """
+
+    def __init__(self, rate: float = 1.0, window: float = 2.0, burst: float = 1.0):
+        self._rate    = rate / window          # tokens per second
+        self._burst   = max(1.0, burst)
+        self._buckets: dict = {}
+        self._base:    dict = {}               # domain → tokens per second (absent = default)
+        self._scale:   dict = {}               # domain → rate factor (absent = 1.0)
+        self._share:   dict = {}               # domain → this shard's fraction (absent = 1.0)
+        self._lock    = ContendedLock("limiter")  # guards bucket creation only
+
+    @staticmethod
+    def _domain(url: str) -> str:
+        try:
             return urlparse(url).netloc
         except Exception:
             return url
 
+    def _bucket(self, domain: str) -> TokenBucket:
+        bucket = self._buckets.get(domain)
+        if bucket is None:
+            with self._lock:
+                bucket = self._buckets.setdefault(domain, TokenBucket(self._rate_for(domain), self._burst))
+        return bucket
+
+    def _rate_for(self, domain: str) -> float:
+        return (
+            self._base.get(domain, self._rate)
+            * self._scale.get(domain, 1.0)
+            * self._share.get(domain, 1.0)
+        )
+
+    @property
+    def default_rate(self) -> float:
+        return self._rate
+
+    def set_rate(self, domain: str, rate: float):
+        """Base tokens per second for `domain`."""
+        with self._lock:
+            self._base[domain] = rate
+            effective = self._rate_for(domain)
+        self._bucket(domain).set_rate(effective, time.monotonic())
+
+    def set_scale(self, domain: str, factor: float):
+        """Run `domain` at `factor` × its base rate (1.0 restores it)."""
+        with self._lock:
+            if factor >= 1.0:
+                self._scale.pop(domain, None)
+            else:
+                self._scale[domain] = factor
+            effective = self._rate_for(domain)
+        self._bucket(domain).set_rate(effective, time.monotonic())
+
+    def set_share(self, domain: str, fraction: float):
+        """This node crawls `domain` together with others — take only `fraction` of its budget."""
+        with self._lock:
+            if fraction >= 1.0:
+                self._share.pop(domain, None)
+            else:
+                self._share[domain] = fraction
+            effective = self._rate_for(domain)
+        self._bucket(domain).set_rate(effective, time.monotonic())
+
+    def hold(self, domain: str, seconds: float):
+        """Hand out no token for `domain` for the next `seconds`."""
+        self._bucket(domain).hold(seconds, time.monotonic())
+
+    def try_acquire(self, domain: str) -> float:
+        """Non-blocking: 0.0 if a token was taken, else seconds until one frees up."""
+        return self._bucket(domain).try_take(time.monotonic())
+
+    def next_ready(self, domain: str) -> float:
+        """Seconds until `domain` can go again, without taking a token."""
+        return self._bucket(domain).wait_time(time.monotonic())
+
+    def rate_of(self, domain: str) -> tuple:
+        """(tokens per second, burst) currently applied to `domain`."""
+        bucket = self._bucket(domain)
+        return bucket.rate, bucket.capacity
+
+    def reserve(self, url: str) -> float:
+        """
+        Claims the next token for the domain and returns the seconds until it
+        is valid. The async engine awaits that delay instead of sleeping.
+        """
+        return self._bucket(self._domain(url)).take(time.monotonic())
+
     def wait_if_needed(self, url: str):
-        domain = self._domain(url)
+        delay = self.reserve(url)
+        if delay > 0:
+            time.sleep(delay)           # no lock held — other domains keep flowing
+
+
+class DomainReadyQueue:
+    """
+    Work queue that only hands out feeds whose domain has a token *now*.
+
+    Feeds are parked on a FIFO per domain. A heap orders domains by the
+    moment their bucket next refills; get() pops the earliest domain that
+    is ready, takes its token and returns its oldest feed. Throttled
+    domains stay parked instead of pinning a sleeping worker, so workers
+    always pick up a request that can go right away.
+
+    put_later() is the retry path: the item waits on a timer heap and is
+    parked once its delay is over, so a backing-off feed costs no worker.
+
+    Every item handed out by get() must be acknowledged with task_done()
+    (after any put_later() for it). close() marks the end of input; get()
+    then returns _SENTINEL once nothing is parked, delayed or still being
+    worked on — a retry can't be stranded after the consumers have left.
+    """
+
+    def __init__(self, limiter: DomainLimiter):
+        self._limiter = limiter
+        self._pending: dict = {}      # domain → deque of (item, parked_at)
+        self._head_since: dict = {}   # domain → when its current first item reached the front
+        self._heap:    list = []      # (ready_at, seq, domain) — one entry per parked domain
+        self._delayed: list = []      # (due_at, seq, item, url) — retries waiting out a backoff
+        self._seq     = itertools.count()
+        self._cond    = threading.Condition(ContendedLock("ready_queue"))
+        self._closed  = False
+        self._outstanding = 0         # handed out by get(), task_done() not yet called
+
+    def _park(self, item, url: str):
+        """Caller holds the condition."""
+        domain = DomainLimiter._domain(url)
+        parked = self._pending.get(domain)
+        now    = time.monotonic()
+        if parked is None:
+            parked = self._pending[domain] = deque()
+            self._head_since[domain] = now
+            heapq.heappush(self._heap, (now, next(self._seq), domain))
+            self._cond.notify()
+        parked.append((item, now))
+
+    def put(self, item, url: str):
+        started = time.perf_counter()
+        with self._cond:
+            self._park(item, url)
+        metrics.stage("enqueue", time.perf_counter() - started)
+
+    def put_later(self, item, url: str, delay: float):
+        with self._cond:
+            heapq.heappush(self._delayed, (time.monotonic() + delay, next(self._seq), item, url))
+            self._cond.notify()
+
+    def task_done(self):
+        with self._cond:
+            self._outstanding -= 1
+            if self._outstanding == 0:
+                self._cond.notify_all()     # idle consumers may be waiting to exit
+
+    def close(self):
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+
+    def __len__(self) -> int:
+        with self._cond:
+            return sum(len(q) for q in self._pending.values()) + len(self._delayed)
+
+    def get(self):
+        with self._cond:
+            while True:
+                now = time.monotonic()
+                while self._delayed and self._delayed[0][0] <= now:
+                    _, _, item, url = heapq.heappop(self._delayed)
+                    self._park(item, url)
+                next_retry = self._delayed[0][0] - now if self._delayed else None
+
+                if not self._heap:
+                    if self._closed and next_retry is None and not self._outstanding:
+                        return _SENTINEL
+                    self._cond.wait(next_retry)
+                    continue
+
+                ready_at, _, domain = self._heap[0]
+                if ready_at > now:
+                    wait = ready_at - now
+                    self._cond.wait(wait if next_retry is None else min(wait, next_retry))
+                    continue
+
+                heapq.heappop(self._heap)
+                wait = self._limiter.try_acquire(domain)
+                if wait > 0:
+                    # Token not back yet — re-park the domain until it is
+                    heapq.heappush(self._heap, (now + wait, next(self._seq), domain))
+                    continue
+
+                parked = self._pending[domain]
+                item, parked_at = parked.popleft()
+                # ready_at is when the token came back: the stretch between reaching
+                # the front and that moment was spent on the rate limit
+                metrics.stage("queue", now - parked_at)
+                metrics.stage("limiter", max(0.0, ready_at - self._head_since[domain]))
+                if parked:
+                    self._head_since[domain] = now
+                    again = now + self._limiter.next_ready(domain)
+                    heapq.heappush(self._heap, (again, next(self._seq), domain))
+                else:
+                    del self._pending[domain], self._head_since[domain]
+                self._outstanding += 1
+                if self._heap or self._delayed:
+                    self._cond.notify()      # let the next idle worker look
+                return item
+
+
+# ══════════════════════════════════════════════════════════════════════
+# MODULE 5a – DOMAIN TUNER  (AIMD rate + concurrency per domain, persisted)
+# ══════════════════════════════════════════════════════════════════════
+class DomainTuner:
+    """
+    Learns how hard each domain may be hit, TCP-style (AIMD):
+
+      additive increase       — every INCREASE_EVERY clean responses the
+                                rate grows by RATE_STEP req/s and the
+                                concurrency by one, up to RATE_MAX / CONC_MAX
+      multiplicative decrease — a 429 halves both; a fast latency EWMA above
+                                LATENCY_FACTOR × the slow baseline cuts them
+                                by LATENCY_BETA. At most one cut per
+                                DECREASE_HOLD seconds, so the burst of 429s
+                                from requests already in flight counts once.
+
+    A 429's Retry-After (seconds or HTTP date) is passed on to the limiter,
+    which hands out no token for that domain until it has passed.
+
+    Learned limits go to listeners (limiter / worker-pool gates) and are
+    saved to `domain_limits.json`, so cointelegraph keeps its fast lane and
+    finviz its slow one across restarts. snapshot() exposes them.
+    """
+    STATE_FILE      = "domain_limits.json"
+    RATE_MIN        = 0.05       # 1 request / 20s
+    RATE_MAX        = 4.0
+    RATE_STEP       = 0.05
+    CONC_MAX        = 8
+    INCREASE_EVERY  = 10
+    THROTTLE_BETA   = 0.5
+    LATENCY_BETA    = 0.8
+    LATENCY_FACTOR  = 2.0
+    DECREASE_HOLD   = 10.0
+    MAX_RETRY_AFTER = 600
+
+    def __init__(self, base_rate: float, base_concurrency: int):
+        self._base_rate = base_rate
+        self._base_conc = base_concurrency
+        self._domains: dict = {}     # domain → {"rate", "conc", "fast", "slow", "ok", "throttles", "cut_at"}
+        self._listeners: list = []
+        self._lock = threading.Lock()
+        self._load()
+
+    def _load(self):
+        for domain, lim in _read_json(self.STATE_FILE, {}).items():
+            st = self._state(domain)
+            st["rate"], st["conc"] = float(lim["rate"]), int(lim["concurrency"])
+            st["slow"], st["throttles"] = lim.get("latency"), lim.get("throttles", 0)
+        if self._domains:
+            log.info(f"DomainTuner: {len(self._domains):,} learned domain limits restored")
+
+    def save(self):
+        _atomic_write_json(self.STATE_FILE, self.snapshot())
+
+    def add_listener(self, fn):
+        """fn(domain, rate, concurrency) is called whenever a domain's limits change."""
+        self._listeners.append(fn)
         with self._lock:
-            now = time.monotonic()
-            self._counts[domain] = [t for t in self._counts[domain] if now - t < self._window]
-            if len(self._counts[domain]) >= self._rate:
-                sleep_for = self._window - (now - self._counts[domain][0])
-                if sleep_for > 0:
-                    time.sleep(sleep_for)
-            self._counts[domain].append(time.monotonic())
+            current = [(d, st["rate"], st["conc"]) for d, st in self._domains.items()]
+        for domain, rate, conc in current:      # restored limits apply immediately
+            fn(domain, rate, conc)
+
+    def _notify(self, domain: str, rate: float, conc: int):
+        for fn in self._listeners:
+            try:
+                fn(domain, rate, conc)
+            except Exception as e:
+                log.warning(f"DomainTuner listener error: {e}")
+
+    def _state(self, domain: str) -> dict:
+        """Caller holds the lock (or is __init__)."""
+        st = self._domains.get(domain)
+        if st is None:
+            st = self._domains[domain] = {
+                "rate": self._base_rate, "conc": self._base_conc, "fast": None,
+                "slow": None, "ok": 0, "throttles": 0, "cut_at": 0.0,
+            }
+        return st
+
+    def limits(self, domain: str) -> tuple:
+        """(requests per second, concurrent connections) currently allowed."""
+        with self._lock:
+            st = self._domains.get(domain)
+            return (st["rate"], st["conc"]) if st else (self._base_rate, self._base_conc)
+
+    def concurrency(self, domain: str) -> int:
+        return self.limits(domain)[1]
+
+    def _cut(self, st: dict, beta: float, now: float) -> bool:
+        """Caller holds the lock. Multiplicative decrease, at most once per DECREASE_HOLD."""
+        if now - st["cut_at"] < self.DECREASE_HOLD:
+            return False
+        st["rate"]   = max(self.RATE_MIN, st["rate"] * beta)
+        st["conc"]   = max(1, int(st["conc"] * beta))
+        st["ok"]     = 0
+        st["cut_at"] = now
+        return True
+
+    def record_response(self, domain: str, latency: float):
+        """A 200/304 came back after `latency` seconds."""
+        now = time.monotonic()
+        with self._lock:
+            st = self._state(domain)
+            st["fast"] = latency if st["fast"] is None else 0.3 * latency + 0.7 * st["fast"]
+            st["slow"] = latency if st["slow"] is None else 0.02 * latency + 0.98 * st["slow"]
+            if st["fast"] > self.LATENCY_FACTOR * max(st["slow"], 0.05):
+                changed = self._cut(st, self.LATENCY_BETA, now)
+                if changed:
+                    log.info(
+                        f"  🐢 {domain}: latency {st['fast']:.2f}s vs {st['slow']:.2f}s baseline "
+                        f"— {st['rate']:.2f} req/s × {st['conc']}"
+                    )
+            else:
+                st["ok"] += 1
+                changed = st["ok"] >= self.INCREASE_EVERY and (
+                    st["rate"] < self.RATE_MAX or st["conc"] < self.CONC_MAX
+                )
+                if changed:
+                    st["ok"]   = 0
+                    st["rate"] = min(self.RATE_MAX, st["rate"] + self.RATE_STEP)
+                    st["conc"] = min(self.CONC_MAX, st["conc"] + 1)
+            rate, conc = st["rate"], st["conc"]
+        if changed:
+            self._notify(domain, rate, conc)
+
+    def record_throttle(self, domain: str, retry_after) -> float:
+        """
+        A 429 came back. Cuts the domain's limits and returns the seconds
+        to stay away (Retry-After, or a default scaled to the new rate).
+        """
+        now = time.monotonic()
+        with self._lock:
+            st = self._state(domain)
+            st["throttles"] += 1
+            changed = self._cut(st, self.THROTTLE_BETA, now)
+            rate, conc = st["rate"], st["conc"]
+        delay = self.parse_retry_after(retry_after)
+        if delay is None:
+            delay = 2.0 / rate
+        if changed:
+            log.warning(f"  🐢 {domain}: 429 — {rate:.2f} req/s × {conc}, quiet for {delay:.0f}s")
+            self._notify(domain, rate, conc)
+        return delay
+
+    @classmethod
+    def parse_retry_after(cls, value):
+        """Retry-After as delta-seconds or an HTTP date → seconds, None if absent/garbled."""
+        if value is None:
+            return None
+        try:
+            seconds = float(value)
+        except (TypeError, ValueError):
+            try:
+                when    = parsedate_to_datetime(str(value))
+                seconds = (when - datetime.now(timezone.utc)).total_seconds()
+            except (TypeError, ValueError):
+                return None
+        return min(cls.MAX_RETRY_AFTER, max(0.0, seconds))
+
+    def snapshot(self) -> dict:
+        """domain → current limits and observations, for inspection and persistence."""
+        with self._lock:
+            return {
+                domain: {
+                    "rate":        round(st["rate"], 4),
+                    "concurrency": st["conc"],
+                    "latency":     round(st["slow"], 4) if st["slow"] is not None else None,
+                    "throttles":   st["throttles"],
+                }
+                for domain, st in sorted(self._domains.items())
+            }
+
+    def stats(self) -> str:
+        with self._lock:
+            rates = [st["rate"] for st in self._domains.values()]
+        if not rates:
+            return "domains=0"
+        faster = sum(r > self._base_rate for r in rates)
+        slower = sum(r < self._base_rate for r in rates)
+        return f"domains={len(rates)}, faster={faster}, slower={slower}"
+
+
+# ══════════════════════════════════════════════════════════════════════
+# MODULE 5b – MAKESPAN PLANNER  (domain critical path first)
+# ══════════════════════════════════════════════════════════════════════
+@dataclass
+class MakespanPlan:
+    order:           list    # [(name, url, cat), ...] in queueing order
+    makespan:        float   # predicted seconds for the whole batch
+    critical_domain: str
+    critical_feeds:  int
+
+
+class MakespanPlanner:
+    """
+    Orders a batch of feeds so the busiest domain starts first.
+
+    A domain with n feeds cannot finish sooner than (n − burst) / rate plus
+    one fetch, however many workers there are — that is its serial time,
+    and the largest one is the batch's critical path. Domains whose circuit
+    is open cost nothing (their feeds are skipped) and are queued last.
+
+    The order is round-robin across domains, heaviest first in every round,
+    so the critical domain's first request goes out immediately and the
+    light domains fill the gaps between its rate-limited slots.
+    Predicted makespan = max(critical path, total fetch time / parallelism).
+    """
+    AVG_FETCH = 1.0        # seconds per request, incl. parse — rough but stable
+
+    def __init__(self, limiter: DomainLimiter, circuit: CircuitBreaker):
+        self.limiter = limiter
+        self.circuit = circuit
+
+    def serial_time(self, domain: str, n_feeds: int) -> float:
+        if n_feeds <= 0 or self.circuit.blocked(domain):
+            return 0.0
+        rate, burst = self.limiter.rate_of(domain)
+        return max(0.0, n_feeds - burst) / rate + self.AVG_FETCH
+
+    def plan(self, feeds: dict, parallelism: int) -> MakespanPlan:
+        by_domain: dict = defaultdict(list)
+        for name, (url, cat) in feeds.items():
+            by_domain[DomainLimiter._domain(url)].append((name, url, cat))
+
+        cost = {d: self.serial_time(d, len(items)) for d, items in by_domain.items()}
+        live = [d for d in by_domain if cost[d] > 0]
+        dead = [d for d in by_domain if cost[d] == 0]
+        live.sort(key=lambda d: cost[d], reverse=True)
+
+        # Round-robin, heaviest domain first in each round
+        order  = []
+        rounds = [by_domain[d] for d in live]
+        for i in range(max((len(r) for r in rounds), default=0)):
+            for r in rounds:
+                if i < len(r):
+                    order.append(r[i])
+        for d in dead:                     # instant skips — keep them out of the way
+            order.extend(by_domain[d])
+
+        n_live   = sum(len(by_domain[d]) for d in live)
+        critical = live[0] if live else ""
+        makespan = max(
+            cost.get(critical, 0.0),
+            n_live * self.AVG_FETCH / max(1, parallelism),
+        )
+        return MakespanPlan(order, makespan, critical, len(by_domain.get(critical, [])))
+
+
+# ══════════════════════════════════════════════════════════════════════
+# MODULE 5c – STREAMING FEED PARSER  (stop early, fall back to feedparser)
+# ══════════════════════════════════════════════════════════════════════
+class StreamingFeedParser:
+    """
+    Incremental RSS/Atom parse that stops as soon as it has what we need.
+
+    The body is pushed through an XMLPullParser in 16 KB chunks; each
+    <item>/<entry> is turned into {title, link, date} when its end tag
+    arrives and then cleared. Parsing stops after `max_entries` entries or
+    after KNOWN_RUN consecutive entries whose link is known — newest-first
+    feeds have seen everything below such a run. A single known entry (a
+    pinned post, a re-dated story) is skipped, not taken as the end. A 2 MB
+    SEC Atom feed is thus usually done after its first few KB instead of
+    being fully parsed.
+
+    Known-ness is asked in batches: `known_many(links) → [bool]` gets the
+    next max_entries + KNOWN_RUN entries at once, so a feed usually costs
+    one lookup — one SQLite query, or one coordinator round-trip on a
+    sharded node — instead of one per entry.
+
+    Anything ElementTree rejects (HTML entities, broken markup) falls back
+    to feedparser with the same stop rules applied to its entries.
+    """
+    CHUNK       = 16 * 1024
+    KNOWN_RUN   = 3             # consecutive known entries that end the parse
+    ENTRY_TAGS  = {"item", "entry"}
+    DATE_TAGS   = ("pubDate", "published", "updated", "date")   # RSS, Atom, Atom, dc:date
+
+    @staticmethod
+    def _local(tag: str) -> str:
+        return tag.rsplit("}", 1)[-1] if "}" in tag else tag
+
+    @classmethod
+    def _entry(cls, elem) -> dict:
+        title = link = None
+        dates = {}
+        for child in elem:
+            tag = cls._local(child.tag)
+            if tag == "title" and title is None:
+                title = (child.text or "").strip()
+            elif tag == "link":
+                href = child.get("href")
+                if href is not None:                      # Atom
+                    if link is None or child.get("rel", "alternate") == "alternate":
+                        link = href
+                elif link is None and child.text:         # RSS
+                    link = child.text.strip()
+            elif tag in cls.DATE_TAGS and child.text:
+                dates.setdefault(tag, child.text.strip())
+        date = next((dates[t] for t in cls.DATE_TAGS if t in dates), "No Date")
+        return {"title": title or "N/A", "link": link or "N/A", "date": date}
+
+    @classmethod
+    def parse(cls, text: str, max_entries: int = 5, known_many=None) -> tuple:
+        """→ (entries, stopped_at_known). Known entries are never returned."""
+        entries, batch = [], []
+        run     = [0]               # consecutive known entries so far
+        try:
+            parser = ET.XMLPullParser(events=("end",))
+            for i in range(0, len(text), cls.CHUNK):
+                parser.feed(text[i:i + cls.CHUNK])
+                for _, elem in parser.read_events():
+                    if cls._local(elem.tag) not in cls.ENTRY_TAGS:
+                        continue
+                    batch.append(cls._entry(elem))
+                    elem.clear()
+                    if len(batch) >= cls._batch_size(entries, max_entries, known_many):
+                        done = cls._take(batch, entries, run, max_entries, known_many)
+                        if done is not None:
+                            return entries, done
+            parser.close()
+        except ET.ParseError:
+            return cls._fallback(text, max_entries, known_many)
+        return entries, bool(cls._take(batch, entries, run, max_entries, known_many))
+
+    @classmethod
+    def _batch_size(cls, entries: list, max_entries: int, known_many) -> int:
+        """Entries to gather before the next lookup: enough to finish in one."""
+        return max_entries - len(entries) + (cls.KNOWN_RUN if known_many is not None else 0)
+
+    @classmethod
+    def _take(cls, batch: list, entries: list, run: list, max_entries: int, known_many):
+        """
+        Apply the stop rules to a batch of entries (one known_many() call) and
+        empty it → None to go on, else stopped_at_known.
+        """
+        if not batch:
+            return None
+        known = known_many([e["link"] for e in batch]) if known_many is not None else [False] * len(batch)
+        pending = batch[:]
+        batch.clear()
+        for entry, is_known in zip(pending, known):
+            if is_known:
+                run[0] += 1
+                if run[0] >= cls.KNOWN_RUN:
+                    return True
+                continue
+            run[0] = 0
+            entries.append(entry)
+            if len(entries) >= max_entries:
+                return False
+        return None
+
+    @classmethod
+    def _fallback(cls, text: str, max_entries: int, known_many) -> tuple:
+        entries, batch = [], []
+        run     = [0]
+        for entry in feedparser.parse(text).entries:
+            batch.append({
+                "title": entry.get("title", "N/A").strip(),
+                "link":  entry.get("link",  "N/A"),
+                "date":  entry.get("published", entry.get("updated", "No Date")),
+            })
+            if len(batch) >= cls._batch_size(entries, max_entries, known_many):
+                done = cls._take(batch, entries, run, max_entries, known_many)
+                if done is not None:
+                    return entries, done
+        return entries, bool(cls._take(batch, entries, run, max_entries, known_many))
+
+
+# ══════════════════════════════════════════════════════════════════════
+# MODULE 5d – LINK CANONICALIZER  (unwrap redirects, strip tracking, normalise)
+# ══════════════════════════════════════════════════════════════════════
+class LinkCanonicalizer:
+    """
+    One key per article, whatever wrapper or tracking it arrived with.
+
+      1. Redirect wrappers are unwrapped offline where the target is in the
+         URL: google.com/url?q=, Bing apiclick ?url= and /ck/a?u=a1<base64>,
+         and the older news.google.com/rss/articles/CBMi… ids whose base64
+         payload embeds the publisher URL. Newer opaque Google ids need a
+         network round-trip and are left as they are.
+      2. Tracking parameters (utm_*, fbclid, gclid, ocid, …) are dropped and
+         the remaining ones sorted; the fragment is dropped.
+      3. Scheme and host are lower-cased, http becomes https, default ports
+         go, and a trailing slash is removed from the path.
+
+    Pure string work, memoised — the same links come back every fetch.
+    """
+    REDIRECT_PARAMS = {           # host → query params that carry the target
+        "www.google.com":  ("url", "q"),
+        "google.com":      ("url", "q"),
+        "news.google.com": ("url",),
+        "www.bing.com":    ("url", "u"),
+        "bing.com":        ("url", "u"),
+    }
+    TRACKING_PREFIXES = ("utm_", "guce_", "__twitter_")
+    TRACKING_PARAMS   = frozenset({
+        "fbclid", "gclid", "dclid", "msclkid", "yclid", "igshid", "mc_cid", "mc_eid",
+        "_ga", "_gl", "ocid", "cvid", "ei", "ncid", "cmpid", "soc_src", "soc_trk",
+        "sr_share", "guccounter", "taid", "ref", "ref_src", ".tsrc", "mod", "smid", "oc",
+    })
+    _EMBEDDED_URL = re.compile(rb"https?://[\x21-\x7e]+")
+
+    @classmethod
+    @lru_cache(maxsize=1 << 16)
+    def canonical(cls, link: str) -> str:
+        link = (link or "").strip()
+        for _ in range(3):                        # wrappers can be nested
+            target = cls._unwrap(link)
+            if target is None:
+                break
+            link = target
+        try:
+            parts = urlparse(link)
+            if parts.scheme not in ("http", "https") or not parts.hostname:
+                return link
+            host = parts.hostname.rstrip(".")
+            port = parts.port if parts.port not in (None, 80, 443) else None
+        except ValueError:                        # bad port / IPv6 literal → keep as given
+            return link
+        netloc = f"{host}:{port}" if port else host
+        path   = parts.path.rstrip("/") or "/"
+        return urlunparse(("https", netloc, path, parts.params, cls._query(parts.query), ""))
+
+    @classmethod
+    def _query(cls, query: str) -> str:
+        """Tracking params dropped, the rest sorted; a bare flag (`?123`) stays bare."""
+        kept = []
+        for pair in query.split("&"):
+            if not pair:
+                continue
+            key, eq, value = pair.partition("=")
+            key = unquote_plus(key)
+            if cls._is_tracking(key):
+                continue
+            kept.append((key, eq, unquote_plus(value)))
+        return "&".join(
+            quote_plus(k) + (f"={quote_plus(v)}" if eq else "") for k, eq, v in sorted(kept)
+        )
+
+    @classmethod
+    def _is_tracking(cls, key: str) -> bool:
+        key = key.lower()
+        return key in cls.TRACKING_PARAMS or key.startswith(cls.TRACKING_PREFIXES)
+
+    @classmethod
+    def _unwrap(cls, link: str):
+        """Target URL if `link` is a redirect wrapper we can decode, else None."""
+        try:
+            parts = urlparse(link)
+        except ValueError:
+            return None
+        host = (parts.hostname or "").lower()
+
+        if host == "news.google.com" and "/articles/" in parts.path:
+            article_id = parts.path.rsplit("/", 1)[-1]
+            try:
+                raw = base64.urlsafe_b64decode(article_id + "=" * (-len(article_id) % 4))
+            except ValueError:
+                return None
+            m = cls._EMBEDDED_URL.search(raw)
+            return m.group().decode("ascii") if m else None
+
+        for key in cls.REDIRECT_PARAMS.get(host, ()):
+            for k, v in parse_qsl(parts.query):
+                if k != key:
+                    continue
+                if v.startswith("a1"):                    # Bing /ck/a: "a1" + base64url
+                    try:
+                        v = base64.urlsafe_b64decode(v[2:] + "=" * (-len(v[2:]) % 4)).decode()
+                    except (ValueError, UnicodeDecodeError):
+                        continue
+                if v.startswith(("http://", "https://")):
+                    return v
+        return None
 
 
 # ══════════════════════════════════════════════════════════════════════
 # MODULE 6 – WORKER POOL  (thread-safe, block-resistant)
 # ══════════════════════════════════════════════════════════════════════
+class ConcurrencyGate:
+    """Semaphore whose limit can be changed while it is in use."""
+
+    def __init__(self, limit: int):
+        self._limit  = limit
+        self._active = 0
+        self._cond   = threading.Condition()
+
+    def set_limit(self, limit: int):
+        with self._cond:
+            self._limit = max(1, limit)
+            self._cond.notify_all()
+
+    def __enter__(self):
+        started = time.perf_counter()
+        with self._cond:
+            while self._active >= self._limit:
+                self._cond.wait()
+            self._active += 1
+        metrics.stage("semaphore", time.perf_counter() - started)
+        return self
+
+    def __exit__(self, *exc):
+        with self._cond:
+            self._active -= 1
+            self._cond.notify()
+
+
 class WorkerPool:
     """
     One DrissionPage SessionPage per thread (thread-local storage).
 
     Anti-block stack applied on every request:
       1. Circuit breaker check  — skip domain if it's in cooldown
-      2. Per-domain semaphore   — max 3 concurrent connections per host
-      3. Domain rate limiter    — max 1 req / 2s per host
+      2. Per-domain gate        — max 3 concurrent connections per host
+                                  (fewer while the circuit is ramping up)
+      3. Domain rate limiter    — max 1 req / 2s per host (token normally
+                                  already taken by DomainReadyQueue)
       4. Full UA+header profile — rotate realistic browser fingerprints
       5. Conditional GET        — ETag / If-Modified-Since headers
       6. 304 handling           — return early, no parsing needed
+         + body digest match    — same bytes as last time, skip parse/store
       7. 429 handling           — respect Retry-After, exponential backoff
+                                  (fetch_once: the retry is re-queued, not slept)
       8. 403/401/451 handling   — instant circuit trip, no retries wasted
       9. Jitter on backoff      — unpredictable timing, not bot-regular
     """
@@ -471,150 +2323,1144 @@ class WorkerPool:
         },
     ]
 
-    _local = threading.local()
+    PER_DOMAIN = 3          # concurrent connections per host at full speed
+
+    _local = threading.local()
+
+    def __init__(
+        self,
+        limiter:    DomainLimiter,
+        circuit:    CircuitBreaker,
+        etag_cache: ConditionalGetCache,
+        known_many=None,
+        tuner:      "DomainTuner" = None,
+        recorder:   "ResponseRecorder" = None,
+    ):
+        self.limiter    = limiter
+        self.circuit    = circuit
+        self.etag_cache = etag_cache
+        self.known_many = known_many    # [link] → [bool], lets the parser stop early
+        self.tuner      = tuner         # learns per-domain limits from latency / 429s
+        self.recorder   = recorder      # opt-in corpus of parsed bodies (replay.py)
+        # Max PER_DOMAIN concurrent connections to any single domain
+        self._domain_sems: dict = defaultdict(lambda: ConcurrencyGate(self.PER_DOMAIN))
+
+    def set_concurrency(self, domain: str, limit: int):
+        self._domain_sems[domain].set_limit(limit)
+
+    def _get_session(self) -> SessionPage:
+        if not hasattr(self._local, "session"):
+            self._local.session = SessionPage()
+        return self._local.session
+
+    @staticmethod
+    def _domain(url: str) -> str:
+        try:
+            return urlparse(url).netloc
+        except Exception:
+            return url
+
+    def _profile(self) -> dict:
+        return random.choice(self.UA_PROFILES)
+
+    def _retry_after(self, domain: str, header, backoff: float) -> float:
+        """Seconds to stay off `domain` after a 429; the limiter holds it that long too."""
+        if self.tuner:
+            delay = self.tuner.record_throttle(domain, header)
+        else:
+            delay = DomainTuner.parse_retry_after(header)
+            delay = backoff * 2 if delay is None else delay
+        self.limiter.hold(domain, delay)
+        return delay
+
+    @staticmethod
+    def _parse_items(name: str, category: str, text: str, max_entries: int = 5, known_many=None) -> list:
+        """
+        Feed body → NewsItems (first `max_entries`, stopping at a run of
+        already-known links when `known_many` is given). Shared by both fetch modes.
+        Items carry the canonical link; the feed's own link is kept as raw_link.
+        """
+        started = time.perf_counter()
+        items, hit_known = WorkerPool._build_items(name, category, text, max_entries, known_many)
+        metrics.stage("parse", time.perf_counter() - started)
+        WorkerPool._log_parse(name, category, items, hit_known)
+        return items
+
+    @staticmethod
+    def _build_items(name: str, category: str, text: str, max_entries: int = 5, known_many=None) -> tuple:
+        """Pure part of _parse_items → (items, stopped_at_known); safe in a parse process."""
+        entries, hit_known = StreamingFeedParser.parse(text, max_entries, known_many)
+        return WorkerPool._to_items(name, category, entries), hit_known
+
+    @staticmethod
+    def _to_items(name: str, category: str, entries: list) -> list:
+        """Parsed entries → NewsItems keyed by their canonical link."""
+        return [
+            NewsItem(
+                source=name, news_type=category, title=e["title"],
+                link=LinkCanonicalizer.canonical(e["link"]), date=e["date"], raw_link=e["link"],
+            )
+            for e in entries
+        ]
+
+    @staticmethod
+    def _log_parse(name: str, category: str, items: list, hit_known: bool):
+        if items:
+            log.info(f"  ✓ [{category:9s}] {name[:45]:<45} → {len(items)} item(s)")
+        elif hit_known:
+            log.info(f"  ○ [{category:9s}] {name[:45]:<45} → nothing new")
+        else:
+            log.info(f"  ○ [{category:9s}] {name[:45]:<45} → empty feed")
+
+    def process_feed(
+        self, name: str, url: str, category: str,
+        max_retries: int = 3, rate_token: bool = False, max_entries: int = 5,
+        stop_at_known: bool = True,
+    ) -> list:
+        """
+        Fetch with retries in the calling thread (backoff is slept here).
+        The engine uses fetch_once() and re-queues retries instead.
+        """
+        job = FetchJob(name, url, category)
+        while True:
+            result = self.fetch_once(job, max_retries, rate_token and not job.attempt, max_entries, stop_at_known)
+            if result.retry_in is None:
+                return result.items
+            time.sleep(result.retry_in)
+            job = job.retry()
+
+    def _retry(self, job: FetchJob, delay: float, max_retries: int, status: int, latency=None) -> FetchResult:
+        """Retry `job` after `delay` seconds, unless it has used up its attempts."""
+        retry_in = delay if job.attempt + 1 < max_retries else None
+        return FetchResult([], retry_in, status, latency)
+
+    def fetch_once(
+        self, job: FetchJob, max_retries: int = 3, rate_token: bool = False,
+        max_entries: int = 5, stop_at_known: bool = True, parse: bool = True,
+    ) -> FetchResult:
+        """
+        One attempt at `job`. A 429 or an error comes back as
+        FetchResult(retry_in=…) instead of a sleep, so the caller can park
+        the job and move on to other domains.
+
+        `rate_token=True` → caller already took this domain's token.
+        `max_entries`     → entries kept per feed (batched feeds keep more).
+        `stop_at_known`   → end the parse at the first already-stored link
+                            (off for relevance-ranked search feeds).
+        `parse=False`     → return the new body in FetchResult.body for the
+                            parse stage (ParsePool) instead of parsing here.
+        """
+        name, url, category = job.name, job.url, job.cat
+        domain  = self._domain(url)
+        session = self._get_session()
+
+        # 1. Circuit breaker — skip immediately if domain is cooling down
+        #    (every attempt; a probing domain only lets the probe's own retries through)
+        gate = self.circuit.admit(domain, job.probe)
+        if gate == "skip":
+            log.debug(f"  ⚡ Skipped (circuit open): {name}")
+            return FetchResult([])
+        job.probe = gate == "probe"
+
+        try:
+            # 2. Per-domain concurrency cap
+            with self._domain_sems[domain]:
+                # 3. Rate limiter (token normally taken by DomainReadyQueue)
+                if not rate_token:
+                    started = time.perf_counter()
+                    self.limiter.wait_if_needed(url)
+                    metrics.stage("limiter", time.perf_counter() - started)
+
+                # 4+5. Full header profile + conditional GET headers
+                headers = {**self._profile(), **self.etag_cache.get_headers(url)}
+                session.set.headers(headers)
+                started = time.monotonic()
+                session.get(url, timeout=15)
+                latency = time.monotonic() - started
+                code = session.response.status_code
+            metrics.stage("http", latency)
+
+            if self.tuner and code in (200, 304):
+                self.tuner.record_response(domain, latency)
+
+            # 6. Not Modified — cheapest possible outcome
+            if code == 304:
+                log.debug(f"  ↩ 304 Not Modified: {name}")
+                self.circuit.record_success(domain)
+                self.etag_cache.record_not_modified()
+                return FetchResult([], None, code, latency)
+
+            # 7. Rate limited — respect Retry-After
+            if code == 429:
+                retry_after = self._retry_after(domain, session.response.headers.get("Retry-After"), job.backoff)
+                log.warning(f"  [429] {name} — backing off {retry_after:.0f}s")
+                self.circuit.record_failure(domain, code)
+                return self._retry(job, retry_after, max_retries, code, latency)
+
+            # 8. Permanent blocks — instant circuit trip, no retries
+            if code in CircuitBreaker.PERM_BLOCK:
+                log.warning(f"  [HTTP {code}] {name} — permanent block, circuit tripped")
+                self.circuit.record_failure(domain, code)
+                return FetchResult([], None, code, latency)
+
+            # Other non-200
+            if code != 200:
+                log.info(f"  ✗ [{category:9s}] {name[:45]:<45} → HTTP {code}")
+                self.circuit.record_failure(domain, code)
+                return FetchResult([], None, code, latency)
+
+            # ── Success ───────────────────────────────────────────────
+            body = session.response.text
+            self.etag_cache.update(url, dict(session.response.headers))
+            self.circuit.record_success(domain)
+
+            # 6b. Same body as last time (no ETag/Last-Modified needed)
+            if self.etag_cache.body_unchanged(url, body):
+                log.debug(f"  ↩ Body unchanged: {name}")
+                return FetchResult([], None, code, latency, len(body))
+
+            if self.recorder:
+                self.recorder.record(name, category, url, code, session.response.headers, body)
+            if not parse:
+                return FetchResult([], None, code, latency, len(body), body)
+            items = self._parse_items(
+                name, category, body, max_entries,
+                self.known_many if stop_at_known else None,
+            )
+            return FetchResult(items, None, code, latency, len(body))
+
+        except Exception as exc:
+            # 9. Jitter on backoff — unpredictable timing
+            #    Timeouts / resets count against the domain like a 5xx
+            #    (a failed probe re-opens instead of idling in "probing")
+            jitter = random.uniform(0.2, 1.2)
+            log.debug(f"  [attempt {job.attempt+1}] {name}: {exc}")
+            self.circuit.record_failure(domain, CircuitBreaker.NETWORK_ERROR)
+            return self._retry(job, job.backoff + jitter, max_retries, CircuitBreaker.NETWORK_ERROR)
+
+
+# ══════════════════════════════════════════════════════════════════════
+# MODULE 6b – ASYNC WORKER POOL  (single event loop, aiohttp)
+# ══════════════════════════════════════════════════════════════════════
+class AsyncConcurrencyGate:
+    """
+    asyncio twin of ConcurrencyGate. set_limit() may be called from any
+    thread, so waiters re-check the limit at least every POLL seconds
+    instead of relying on a cross-thread notify.
+    """
+    POLL = 1.0
+
+    def __init__(self, limit: int):
+        self._limit  = limit
+        self._active = 0
+        self._cond   = None          # created lazily inside the running loop
+
+    def set_limit(self, limit: int):
+        self._limit = max(1, limit)
+
+    async def __aenter__(self):
+        if self._cond is None:
+            self._cond = asyncio.Condition()
+        started = time.perf_counter()
+        async with self._cond:
+            while self._active >= self._limit:
+                try:
+                    await asyncio.wait_for(self._cond.wait(), self.POLL)
+                except asyncio.TimeoutError:
+                    pass
+            self._active += 1
+        metrics.stage("semaphore", time.perf_counter() - started)
+        return self
+
+    async def __aexit__(self, *exc):
+        async with self._cond:
+            self._active -= 1
+            self._cond.notify()
+
+
+class AsyncWorkerPool:
+    """
+    asyncio twin of WorkerPool: one event loop and one aiohttp session
+    carry thousands of in-flight feeds instead of 50 mostly-parked threads.
+
+    Same anti-block stack, same order:
+      1. Circuit breaker check  — shared CircuitBreaker instance
+      2. Per-domain gate        — AsyncConcurrencyGate(3) per host
+      3. Domain rate limiter    — DomainReadyQueue token, or reserve() awaited
+      4+5. UA profile + conditional GET headers
+      6–9. 304 / 429 / 403 handling and jittered backoff (re-queued, not awaited)
+
+    Parsing is CPU-bound, so it runs in the loop's default executor.
+    """
+
+    def __init__(
+        self,
+        limiter:    DomainLimiter,
+        circuit:    CircuitBreaker,
+        etag_cache: ConditionalGetCache,
+        known_many=None,
+        tuner:      "DomainTuner" = None,
+        recorder:   "ResponseRecorder" = None,
+    ):
+        if aiohttp is None:
+            raise RuntimeError("fetch_mode='async' needs aiohttp — pip install aiohttp")
+        self.limiter    = limiter
+        self.circuit    = circuit
+        self.etag_cache = etag_cache
+        self.known_many = known_many
+        self.tuner      = tuner
+        self.recorder   = recorder
+        self._timeout   = aiohttp.ClientTimeout(total=15)
+        self._domain_sems: dict = defaultdict(lambda: AsyncConcurrencyGate(WorkerPool.PER_DOMAIN))
+
+    def set_concurrency(self, domain: str, limit: int):
+        self._domain_sems[domain].set_limit(limit)
+
+    _retry_after = WorkerPool._retry_after      # same 429 / retry bookkeeping, no I/O
+    _retry       = WorkerPool._retry
+
+    async def process_feed(
+        self, http, name: str, url: str, category: str,
+        max_retries: int = 3, rate_token: bool = False, max_entries: int = 5,
+        stop_at_known: bool = True,
+    ) -> list:
+        """Fetch with retries, backoff awaited here; the engine re-queues via fetch_once()."""
+        job = FetchJob(name, url, category)
+        while True:
+            result = await self.fetch_once(
+                http, job, max_retries, rate_token and not job.attempt, max_entries, stop_at_known
+            )
+            if result.retry_in is None:
+                return result.items
+            await asyncio.sleep(result.retry_in)
+            job = job.retry()
+
+    async def fetch_once(
+        self, http, job: FetchJob, max_retries: int = 3, rate_token: bool = False,
+        max_entries: int = 5, stop_at_known: bool = True, parse: bool = True,
+    ) -> FetchResult:
+        name, url, category = job.name, job.url, job.cat
+        domain = WorkerPool._domain(url)
+
+        # 1. Circuit breaker — skip immediately if domain is cooling down
+        #    (every attempt; a probing domain only lets the probe's own retries through)
+        gate = self.circuit.admit(domain, job.probe)
+        if gate == "skip":
+            log.debug(f"  ⚡ Skipped (circuit open): {name}")
+            return FetchResult([])
+        job.probe = gate == "probe"
+
+        try:
+            # 2. Per-domain concurrency cap
+            async with self._domain_sems[domain]:
+                # 3. Rate limiter — reserve a token, await it
+                if not rate_token:
+                    delay = self.limiter.reserve(url)
+                    metrics.stage("limiter", delay)
+                    await asyncio.sleep(delay)
+
+                # 4+5. Full header profile + conditional GET headers
+                headers = {**random.choice(WorkerPool.UA_PROFILES), **self.etag_cache.get_headers(url)}
+                started = time.monotonic()
+                async with http.get(url, headers=headers, timeout=self._timeout) as resp:
+                    latency      = time.monotonic() - started
+                    code         = resp.status
+                    resp_headers = resp.headers
+                    body         = await resp.text(errors="replace") if code == 200 else ""
+            metrics.stage("http", latency)
+
+            if self.tuner and code in (200, 304):
+                self.tuner.record_response(domain, latency)
+
+            # 6. Not Modified
+            if code == 304:
+                log.debug(f"  ↩ 304 Not Modified: {name}")
+                self.circuit.record_success(domain)
+                self.etag_cache.record_not_modified()
+                return FetchResult([], None, code, latency)
+
+            # 7. Rate limited — respect Retry-After
+            if code == 429:
+                retry_after = self._retry_after(domain, resp_headers.get("Retry-After"), job.backoff)
+                log.warning(f"  [429] {name} — backing off {retry_after:.0f}s")
+                self.circuit.record_failure(domain, code)
+                return self._retry(job, retry_after, max_retries, code, latency)
+
+            # 8. Permanent blocks
+            if code in CircuitBreaker.PERM_BLOCK:
+                log.warning(f"  [HTTP {code}] {name} — permanent block, circuit tripped")
+                self.circuit.record_failure(domain, code)
+                return FetchResult([], None, code, latency)
+
+            # Other non-200
+            if code != 200:
+                log.info(f"  ✗ [{category:9s}] {name[:45]:<45} → HTTP {code}")
+                self.circuit.record_failure(domain, code)
+                return FetchResult([], None, code, latency)
+
+            # ── Success ───────────────────────────────────────────────
+            self.etag_cache.update(url, resp_headers)
+            self.circuit.record_success(domain)
+
+            # 6b. Same body as last time
+            if self.etag_cache.body_unchanged(url, body):
+                log.debug(f"  ↩ Body unchanged: {name}")
+                return FetchResult([], None, code, latency, len(body))
+
+            if self.recorder:
+                self.recorder.record(name, category, url, code, resp_headers, body)
+            if not parse:
+                return FetchResult([], None, code, latency, len(body), body)
+            loop  = asyncio.get_running_loop()
+            items = await loop.run_in_executor(
+                None, WorkerPool._parse_items, name, category, body, max_entries,
+                self.known_many if stop_at_known else None,
+            )
+            return FetchResult(items, None, code, latency, len(body))
+
+        except Exception as exc:
+            # 9. Jitter on backoff (network errors count against the domain)
+            jitter = random.uniform(0.2, 1.2)
+            log.debug(f"  [attempt {job.attempt+1}] {name}: {exc}")
+            self.circuit.record_failure(domain, CircuitBreaker.NETWORK_ERROR)
+            return self._retry(job, job.backoff + jitter, max_retries, CircuitBreaker.NETWORK_ERROR)
+
+
+# ══════════════════════════════════════════════════════════════════════
+# MODULE 6c – PARSE POOL  (feed parsing in worker processes, off the GIL)
+# ══════════════════════════════════════════════════════════════════════
+def _parse_job(name: str, category: str, body: str, max_entries: int, known) -> tuple:
+    """
+    Runs inside a parse process. `known` = links this feed led with last
+    time, or None. → (items, stopped_at_known, parse seconds) — the time
+    is measured here because the child's metrics never reach the engine.
+    """
+    known_many = None
+    if known is not None:
+        known_many = lambda links: [LinkCanonicalizer.canonical(link) in known for link in links]
+    started = time.perf_counter()
+    items, hit_known = WorkerPool._build_items(name, category, body, max_entries, known_many)
+    return items, hit_known, time.perf_counter() - started
+
+
+class ParsePool:
+    """
+    Parse stage between fetch and drain: feed bodies go to a
+    ProcessPoolExecutor, so parsing scales with cores instead of competing
+    with network I/O for the GIL.
+
+    At most `max_pending` bodies are queued or being parsed; submit() blocks
+    the fetcher beyond that, which is the backpressure that keeps a parse
+    backlog from growing without bound in memory.
+
+    A parse process cannot ask the LinkIndex, so the early exit uses the
+    links each feed led with on its previous parse (RECENT_LINKS per feed);
+    DataWarehouse still dedups everything exactly. Processes are spawned,
+    not forked — the engine is full of threads holding locks.
+    """
+    RECENT_LINKS = 20
+
+    def __init__(self, processes: int, max_pending: int = None):
+        self.processes = processes
+        self._executor = ProcessPoolExecutor(processes, mp_context=multiprocessing.get_context("spawn"))
+        self._slots    = threading.BoundedSemaphore(max_pending or processes * 4)
+        self._recent: dict = {}          # feed name → frozenset of canonical links
+        self._pending  = 0
+        self._idle     = threading.Condition()
+
+    def submit(self, name: str, category: str, body: str, max_entries: int, stop_at_known: bool, on_done):
+        """Parse `body` in a worker process; on_done(items) runs when it is finished."""
+        self._slots.acquire()
+        with self._idle:
+            self._pending += 1
+        known = self._recent.get(name, frozenset()) if stop_at_known else None
+        try:
+            future = self._executor.submit(_parse_job, name, category, body, max_entries, known)
+        except Exception:
+            self._release()
+            raise
+        future.add_done_callback(lambda f: self._done(f, name, category, on_done))
+
+    def _done(self, future, name: str, category: str, on_done):
+        try:
+            items, hit_known, seconds = future.result()
+            metrics.stage("parse", seconds)
+        except Exception as exc:
+            log.warning(f"  Parse failed [{name}]: {exc}")
+            items, hit_known = [], False
+        try:
+            WorkerPool._log_parse(name, category, items, hit_known)
+            if items:
+                self._recent[name] = frozenset(i.link for i in items[: self.RECENT_LINKS])
+            on_done(items)
+        finally:
+            self._release()
+
+    def _release(self):
+        self._slots.release()
+        with self._idle:
+            self._pending -= 1
+            if not self._pending:
+                self._idle.notify_all()
+
+    def wait_idle(self):
+        """Block until every submitted body has been parsed and handed on."""
+        with self._idle:
+            while self._pending:
+                self._idle.wait()
+
+    def close(self):
+        self.wait_idle()
+        self._executor.shutdown()
+
+
+# ══════════════════════════════════════════════════════════════════════
+# MODULE 6d – RESPONSE RECORDER  (opt-in corpus of real feed bodies, for replay.py)
+# ══════════════════════════════════════════════════════════════════════
+class ResponseRecorder:
+    """
+    Captures the 200 responses that reach the parse stage — url, feed,
+    status, headers, body — into gzip'd JSON-lines files under `directory`,
+    so replay.py can push real payloads through parse → canonicalize →
+    dedup → store without the network in the way.
+
+    record() only appends to a pending list under the lock; a background
+    flusher writes every FLUSH_EVERY seconds, each write one complete gzip
+    member, so a crash costs at most the last member. Files rotate at
+    MAX_FILE_BYTES (uncompressed). When the flusher falls behind, records
+    beyond MAX_PENDING are dropped and counted — fetching never waits.
+    """
+    FLUSH_EVERY    = 2.0
+    MAX_PENDING    = 2_000
+    MAX_FILE_BYTES = 256 * 1024 * 1024
+
+    def __init__(self, directory: str, sample: float = 1.0):
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.sample    = sample
+        self._pending: list = []
+        self._lock     = threading.Lock()       # pending list only — never held for I/O
+        self._io_lock  = threading.Lock()
+        self._path     = None
+        self._file_bytes = 0
+        self.recorded  = 0
+        self.dropped   = 0
+        threading.Thread(target=self._flush_loop, daemon=True, name="ResponseRecorder").start()
+
+    def record(self, name: str, category: str, url: str, status: int, headers: dict, body: str):
+        if self.sample < 1.0 and random.random() >= self.sample:
+            return
+        row = {
+            "t": time.time(), "name": name, "cat": category, "url": url,
+            "status": status, "headers": dict(headers), "body": body,
+        }
+        with self._lock:
+            if len(self._pending) >= self.MAX_PENDING:
+                self.dropped += 1
+                return
+            self._pending.append(row)
+
+    def _flush_loop(self):
+        while True:
+            time.sleep(self.FLUSH_EVERY)
+            self.flush()
+
+    def flush(self):
+        with self._lock:
+            rows, self._pending = self._pending, []
+        if not rows:
+            return
+        data = "".join(json.dumps(r, ensure_ascii=False) + "\n" for r in rows).encode()
+        with self._io_lock:
+            if self._path is None or self._file_bytes >= self.MAX_FILE_BYTES:
+                stamp = datetime.now(timezone.utc).strftime("%Y%m%d-%H%M%S")
+                self._path = os.path.join(self.directory, f"responses-{stamp}-{os.getpid()}.jsonl.gz")
+                self._file_bytes = 0
+                log.info(f"📼 Recording responses → {self._path}")
+            try:
+                with open(self._path, "ab") as f:
+                    f.write(gzip.compress(data))
+                self._file_bytes += len(data)
+                self.recorded    += len(rows)
+            except OSError as exc:
+                log.warning(f"ResponseRecorder write error: {exc}")
+
+    def close(self):
+        self.flush()
+
+    def stats(self) -> str:
+        return f"{self.recorded:,} recorded, {self.dropped:,} dropped"
+
+    @staticmethod
+    def read(path: str):
+        """Yield recorded responses from a corpus file or directory, oldest file first."""
+        if os.path.isdir(path):
+            files = sorted(
+                os.path.join(path, f) for f in os.listdir(path) if f.endswith(".jsonl.gz")
+            )
+        else:
+            files = [path]
+        for file in files:
+            try:
+                with gzip.open(file, "rt", encoding="utf-8") as f:
+                    for line in f:
+                        yield json.loads(line)
+            except (EOFError, OSError, zlib.error, ValueError) as exc:
+                # Torn last member from a crash — everything before it is intact
+                log.warning(f"ResponseRecorder: {file} ends early ({exc})")
+
+
+# ══════════════════════════════════════════════════════════════════════
+# MODULE 7 – LINK INDEX  (on-disk dedup, hashed fingerprints in SQLite)
+# ══════════════════════════════════════════════════════════════════════
+class LinkIndex:
+    """
+    Persistent set of link fingerprints — 64-bit BLAKE2b of the link, stored
+    as the INTEGER key of a WITHOUT ROWID SQLite table.
+
+    Opening is constant-time and nothing is loaded into RAM; a membership
+    check is one B-tree probe. The known-link count lives in a meta row so
+    status lines don't need a COUNT(*) scan. migrate_csv() back-fills the
+    index from an existing warehouse CSV exactly once.
+
+    Keys are canonical links (LinkCanonicalizer), like every lookup. An
+    index filled before that — raw links from the CSV or from SqliteStore
+    rows — gets the canonical keys added once by backfill().
+    """
+    DB_FILE = "link_index.db"
+
+    def __init__(self, path: str = DB_FILE):
+        self.path  = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("CREATE TABLE IF NOT EXISTS links (fp INTEGER PRIMARY KEY) WITHOUT ROWID")
+        self._conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+        self._count = int(self._meta("count") or 0)
+
+    def _meta(self, key: str):
+        row = self._conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    @staticmethod
+    def fingerprint(link: str) -> int:
+        digest = hashlib.blake2b(link.encode("utf-8", "replace"), digest_size=8).digest()
+        return int.from_bytes(digest, "big", signed=True)
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __contains__(self, link: str) -> bool:
+        with self._lock:
+            return self._conn.execute(
+                "SELECT 1 FROM links WHERE fp = ?", (self.fingerprint(link),)
+            ).fetchone() is not None
+
+    def filter_new(self, links: list) -> list:
+        """Links not in the index yet (duplicates within `links` collapsed)."""
+        by_fp = {}
+        for link in links:
+            by_fp.setdefault(self.fingerprint(link), link)
+        if not by_fp:
+            return []
+        fps = list(by_fp)
+        with self._lock:
+            known = set()
+            for i in range(0, len(fps), 500):          # stay under SQLite's param limit
+                chunk = fps[i:i + 500]
+                marks = ",".join("?" * len(chunk))
+                known.update(r[0] for r in self._conn.execute(
+                    f"SELECT fp FROM links WHERE fp IN ({marks})", chunk
+                ))
+        return [link for fp, link in by_fp.items() if fp not in known]
+
+    def add_many(self, links) -> int:
+        rows = [(self.fingerprint(l),) for l in links]
+        with self._lock:
+            before = self._conn.total_changes
+            self._conn.execute("BEGIN")
+            self._conn.executemany("INSERT OR IGNORE INTO links (fp) VALUES (?)", rows)
+            added = self._conn.total_changes - before
+            self._count += added
+            self._conn.execute(
+                "INSERT OR REPLACE INTO meta (key, value) VALUES ('count', ?)", (str(self._count),)
+            )
+            self._conn.execute("COMMIT")
+        return added
+
+    def backfill(self, links, marker: str, source: str) -> int:
+        """Index the canonical form of every link in `links`, once per `marker`."""
+        if self._meta(marker):
+            return 0
+        t0, batch, total = time.monotonic(), [], 0
+        for link in links:
+            batch.append(LinkCanonicalizer.canonical(link))
+            if len(batch) >= 5000:
+                total += self.add_many(batch)
+                batch = []
+        total += self.add_many(batch)
+        with self._lock:
+            self._conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (marker, source))
+        log.info(f"LinkIndex: {total:,} canonical links indexed from {source} in {time.monotonic() - t0:.1f}s")
+        return total
+
+    def migrate_csv(self, csv_path: str, link_col: int = 3):
+        """
+        One-shot import of every link already in `csv_path`. Indexes migrated
+        before canonical keys ("csv_migrated" only) are re-keyed the same way.
+        """
+        if not os.path.exists(csv_path):
+            return
+
+        def links():
+            with open(csv_path, "r", encoding="utf-8", errors="replace", newline="") as f:
+                for row in csv.reader(f):
+                    # Header-less files (Discord appends too) → link/url is always column 3
+                    if len(row) > link_col and row[link_col] not in ("link", "url"):
+                        yield row[link_col]
+
+        self.backfill(links(), "csv_canonical", csv_path)
+
+
+# ══════════════════════════════════════════════════════════════════════
+# MODULE 7a – STORY CLUSTERS  (MinHash + LSH over titles, sliding window)
+# ══════════════════════════════════════════════════════════════════════
+class StoryClusterer:
+    """
+    Groups near-identical headlines from different sources into one story.
+
+    A title is normalised (lower-case, publisher suffix like " - CNBC"
+    dropped, stop words removed, plural "s" trimmed) into a set of content
+    words. Two titles are the same story when the Jaccard similarity of
+    their word sets is at least THRESHOLD: "Fed holds rates steady…" and
+    "Fed leaves rates unchanged…" share 7 of 11 words (0.64), a swapped
+    synonym in an eight-word headline still scores 0.78, while unrelated
+    headlines on the same topic stay well under 0.5. (A word-bigram SimHash
+    only matched titles that were identical after normalisation — one
+    changed word moves 10–26 of its 64 bits.)
+
+    Lookup is MinHash LSH: NUM_HASHES min-hashes per title, cut into BANDS
+    bands of ROWS; each band keys a dict of recent titles. A pair with
+    Jaccard J shares a band with probability 1 - (1 - J^ROWS)^BANDS — 0.88
+    at J=0.5, 0.99 at 0.64 — and candidates are confirmed with the exact
+    Jaccard of the stored word sets, so lookups stay in the microseconds
+    however big the corpus gets. Entries older than WINDOW seconds are
+    evicted, which bounds memory and stops a recurring headline ("Stocks
+    open higher") from joining yesterday's story.
+
+    Titles with fewer than MIN_WORDS content words ("Apple earnings") carry
+    too little text to tell stories apart, so they are never clustered and
+    always stored.
+    """
+    BANDS        = 16
+    ROWS         = 3
+    NUM_HASHES   = BANDS * ROWS
+    THRESHOLD    = 0.5
+    MIN_WORDS    = 3
+    MAX_BUCKET   = 16            # newest candidates checked per band (hot buckets stay cheap)
+    WINDOW       = 48 * 3600
+
+    _WORD      = re.compile(r"[a-z0-9$%.]+")
+    _PUBLISHER = re.compile(r"\s+[-|–—]\s+[^-|–—]{1,40}$")
+    STOP_WORDS = frozenset(
+        "a an the and or of to in on for at by with from as is are was were be "
+        "its it this that after over into amid says say".split()
+    )
+    # One SHAKE-128 read per word yields all NUM_HASHES 32-bit hash values;
+    # unseeded, so signatures — and LSH buckets — match in every process
+    _HASHES = struct.Struct(f"<{NUM_HASHES}I")
+
+    def __init__(self):
+        self._bands  = [defaultdict(list) for _ in range(self.BANDS)]   # band signature → [entry ids]
+        self._entries: dict = {}                                       # id → (words, band keys, cluster_id)
+        self._expiry = deque()                                         # (added_at, id), oldest first
+        self._ids    = itertools.count()
+        self._lock   = threading.Lock()
+        self._seen = self._joined = 0
+
+    @classmethod
+    def words(cls, title: str):
+        """Content-word set of the title, or None when it is too short to cluster."""
+        title = cls._PUBLISHER.sub("", title.lower())
+        words = set()
+        for w in cls._WORD.findall(title):
+            w = w.strip(".")
+            if not w or w in cls.STOP_WORDS:
+                continue
+            if len(w) > 3 and w.endswith("s") and not w.endswith("ss"):
+                w = w[:-1]
+            words.add(w)
+        return frozenset(words) if len(words) >= cls.MIN_WORDS else None
+
+    @classmethod
+    def _band_keys(cls, words: frozenset) -> list:
+        """MinHash signature of `words`, cut into BANDS hashable band keys."""
+        rows = [cls._HASHES.unpack(hashlib.shake_128(w.encode()).digest(cls._HASHES.size)) for w in words]
+        sig  = list(map(min, zip(*rows)))
+        return [tuple(sig[i * cls.ROWS:(i + 1) * cls.ROWS]) for i in range(cls.BANDS)]
+
+    @staticmethod
+    def _cluster_id(words: frozenset) -> str:
+        return hashlib.blake2b(" ".join(sorted(words)).encode(), digest_size=8).hexdigest()
+
+    def _evict(self, now: float):
+        """Caller holds the lock."""
+        while self._expiry and now - self._expiry[0][0] > self.WINDOW:
+            _, entry = self._expiry.popleft()
+            _, keys, _ = self._entries.pop(entry)
+            for band, key in zip(self._bands, keys):
+                bucket = band[key]
+                bucket.remove(entry)
+                if not bucket:
+                    del band[key]
+
+    def _add(self, words: frozenset, keys: list, cluster_id: str, now: float):
+        """Caller holds the lock."""
+        entry = next(self._ids)
+        self._entries[entry] = (words, keys, cluster_id)
+        self._expiry.append((now, entry))
+        for band, key in zip(self._bands, keys):
+            band[key].append(entry)
+
+    def assign(self, title: str, now: float = None) -> tuple:
+        """→ (cluster_id, is_new_story). The title joins the window either way,
+        unless it is too short to cluster: then ("", True), nothing kept."""
+        now   = time.time() if now is None else now
+        words = self.words(title)
+        keys  = self._band_keys(words) if words else None
+        with self._lock:
+            self._evict(now)
+            self._seen += 1
+            if words is None:
+                return "", True
+            best, best_sim, checked = None, self.THRESHOLD, set()
+            for band, key in zip(self._bands, keys):
+                for entry in band.get(key, ())[-self.MAX_BUCKET:]:
+                    if entry in checked:
+                        continue
+                    checked.add(entry)
+                    other, _, cluster_id = self._entries[entry]
+                    sim = len(words & other) / len(words | other)
+                    if sim >= best_sim:
+                        best, best_sim = cluster_id, sim
+            is_new = best is None
+            if is_new:
+                best = self._cluster_id(words)
+            else:
+                self._joined += 1
+            self._add(words, keys, best, now)
+        return best, is_new
+
+    def warm(self, rows):
+        """Re-load recent (title, cluster_id, added_at) rows after a restart."""
+        with self._lock:
+            for title, cluster_id, added_at in rows:
+                words = self.words(title) if cluster_id else None
+                if words is not None:
+                    self._add(words, self._band_keys(words), cluster_id, added_at)
+            self._evict(time.time())
+        log.info(f"StoryClusterer: {len(self._entries):,} recent titles re-loaded")
+
+    def __len__(self) -> int:
+        return len(self._entries)
 
-    def __init__(
-        self,
-        limiter:    DomainLimiter,
-        circuit:    CircuitBreaker,
-        etag_cache: ConditionalGetCache,
-    ):
-        self.limiter    = limiter
-        self.circuit    = circuit
-        self.etag_cache = etag_cache
-        # Max 3 concurrent connections to any single domain
-        self._domain_sems: dict = defaultdict(lambda: threading.Semaphore(3))
+    def stats(self, reset: bool = False) -> str:
+        with self._lock:
+            seen, joined = self._seen, self._joined
+            if reset:
+                self._seen = self._joined = 0
+        share = joined / seen if seen else 0.0
+        return f"window={len(self._entries):,} titles | {share:.0%} of {seen:,} joined an existing story"
 
-    def _get_session(self) -> SessionPage:
-        if not hasattr(self._local, "session"):
-            self._local.session = SessionPage()
-        return self._local.session
 
-    @staticmethod
-    def _domain(url: str) -> str:
-        try:
-            return urlparse(url).netloc
-        except Exception:
-            return url
+# ══════════════════════════════════════════════════════════════════════
+# MODULE 7b – STORAGE BACKENDS  (SQLite WAL primary, CSV export)
+# ══════════════════════════════════════════════════════════════════════
+class StorageBackend(ABC):
+    """Where saved NewsItems end up. Rows arrive already deduplicated."""
 
-    def _profile(self) -> dict:
-        return random.choice(self.UA_PROFILES)
+    @abstractmethod
+    def write(self, rows: list): ...
 
-    def process_feed(self, name: str, url: str, category: str, max_retries: int = 3) -> list:
-        domain  = self._domain(url)
-        session = self._get_session()
-        backoff = 1.5
+    @abstractmethod
+    def flush(self): ...
 
-        # 1. Circuit breaker — skip immediately if domain is cooling down
-        if self.circuit.is_open(domain):
-            log.debug(f"  ⚡ Skipped (circuit open): {name}")
-            return []
+    @abstractmethod
+    def close(self): ...
 
-        for attempt in range(max_retries):
-            try:
-                # 2. Per-domain concurrency cap
-                with self._domain_sems[domain]:
-                    # 3. Rate limiter
-                    self.limiter.wait_if_needed(url)
+    def describe(self) -> str:
+        return type(self).__name__
 
-                    # 4+5. Full header profile + conditional GET headers
-                    headers = {**self._profile(), **self.etag_cache.get_headers(url)}
-                    session.set.headers(headers)
-                    session.get(url, timeout=15)
-                    code = session.response.status_code
-
-                # 6. Not Modified — cheapest possible outcome
-                if code == 304:
-                    log.debug(f"  ↩ 304 Not Modified: {name}")
-                    self.circuit.record_success(domain)
-                    return []
-
-                # 7. Rate limited — respect Retry-After
-                if code == 429:
-                    retry_after = int(session.response.headers.get("Retry-After", backoff * 2))
-                    log.warning(f"  [429] {name} — backing off {retry_after}s")
-                    self.circuit.record_failure(domain, code)
-                    time.sleep(retry_after)
-                    backoff *= 2
-                    continue
 
-                # 8. Permanent blocks — instant circuit trip, no retries
-                if code in CircuitBreaker.PERM_BLOCK:
-                    log.warning(f"  [HTTP {code}] {name} — permanent block, circuit tripped")
-                    self.circuit.record_failure(domain, code)
-                    return []
+class CsvStore(StorageBackend):
+    """
+    The original append-only CSV, now on one persistent handle instead of
+    a reopen per feed. Flushed per write so other readers see rows promptly.
 
-                # Other non-200
-                if code != 200:
-                    log.info(f"  ✗ [{category:9s}] {name[:45]:<45} → HTTP {code}")
-                    self.circuit.record_failure(domain, code)
-                    break
+    An existing file keeps the columns of its header (a headerless legacy
+    file keeps the original six); fields added later are only written to
+    new files, so old exports never get misaligned rows.
+    """
+    LEGACY_FIELDS = ["source", "news_type", "title", "link", "date", "fetched_at"]
 
-                # ── Success ───────────────────────────────────────────
-                self.etag_cache.update(url, dict(session.response.headers))
-                self.circuit.record_success(domain)
+    def __init__(self, filename: str, fields: list):
+        self.filename = filename
+        self._fields  = fields
+        self._file    = None
+        self._writer  = None
 
-                parsed = feedparser.parse(session.response.text)
-                items  = []
-                for entry in parsed.entries[:5]:
-                    items.append(NewsItem(
-                        source    = name,
-                        news_type = category,
-                        title     = entry.get("title", "N/A").strip(),
-                        link      = entry.get("link",  "N/A"),
-                        date      = entry.get("published", entry.get("updated", "No Date")),
-                    ))
-
-                if items:
-                    log.info(f"  ✓ [{category:9s}] {name[:45]:<45} → {len(items)} item(s)")
-                else:
-                    log.info(f"  ○ [{category:9s}] {name[:45]:<45} → empty feed")
-                return items
+    def _existing_fields(self) -> list:
+        with open(self.filename, newline="", encoding="utf-8") as f:
+            first = next(csv.reader(f), None)
+        if first and set(first) <= set(self._fields) and "link" in first:
+            return first
+        return self.LEGACY_FIELDS
 
-            except Exception as exc:
-                # 9. Jitter on backoff — unpredictable timing
-                jitter = random.uniform(0.2, 1.2)
-                log.debug(f"  [attempt {attempt+1}] {name}: {exc}")
-                time.sleep(backoff + jitter)
-                backoff *= 2
+    def _open(self):
+        file_exists  = os.path.isfile(self.filename) and os.path.getsize(self.filename) > 0
+        fields       = self._existing_fields() if file_exists else self._fields
+        self._file   = open(self.filename, "a", newline="", encoding="utf-8")
+        self._writer = csv.DictWriter(self._file, fieldnames=fields, extrasaction="ignore")
+        if not file_exists:
+            self._writer.writeheader()
+
+    def write(self, rows: list):
+        if self._file is None:
+            self._open()
+        self._writer.writerows(rows)
+        self._file.flush()
+
+    def flush(self):
+        if self._file is not None:       # already flushed per write; cheap no-op
+            self._file.flush()
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = self._writer = None
+
+    def describe(self) -> str:
+        return f"CSV → {os.path.abspath(self.filename)}"
+
+
+class SqliteStore(StorageBackend):
+    """
+    `news` table in a WAL-mode SQLite database.
+
+    Inserts are group-committed: rows collect in memory and go to disk in
+    one transaction once `commit_rows` are pending or the oldest has waited
+    `commit_interval` seconds (checked on write and on flush()). UNIQUE on
+    link makes concurrent writers — e.g. the Discord ingester — safe via
+    INSERT OR IGNORE; source, news_type and fetched_at are indexed for
+    queries. WAL lets readers run while the engine writes.
+    """
+    DB_FILE = "market_news.db"
+
+    def __init__(self, path: str = DB_FILE, fields: list = None, commit_rows: int = 500, commit_interval: float = 2.0):
+        self.path             = path
+        self._fields          = fields
+        self._commit_rows     = commit_rows
+        self._commit_interval = commit_interval
+        self._pending: list   = []
+        self._oldest          = 0.0
+        self._lock            = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("PRAGMA busy_timeout=5000")
+        cols = ", ".join(f"{f} TEXT" for f in fields if f != "link")
+        self._conn.execute(
+            f"CREATE TABLE IF NOT EXISTS news (id INTEGER PRIMARY KEY, link TEXT NOT NULL, {cols})"
+        )
+        # Databases from before a field existed get the column added in place
+        have = {row[1] for row in self._conn.execute("PRAGMA table_info(news)")}
+        for f in fields:
+            if f not in have:
+                self._conn.execute(f"ALTER TABLE news ADD COLUMN {f} TEXT")
+        self._conn.execute("CREATE UNIQUE INDEX IF NOT EXISTS ux_news_link    ON news(link)")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS ix_news_source        ON news(source)")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS ix_news_news_type     ON news(news_type)")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS ix_news_fetched_at    ON news(fetched_at)")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS ix_news_cluster_id    ON news(cluster_id)")
+        self._insert = (
+            f"INSERT OR IGNORE INTO news ({', '.join(fields)}) "
+            f"VALUES ({', '.join('?' * len(fields))})"
+        )
+
+    def write(self, rows: list):
+        with self._lock:
+            if not self._pending:
+                self._oldest = time.monotonic()
+            self._pending.extend(tuple(r[f] for f in self._fields) for r in rows)
+            due = (
+                len(self._pending) >= self._commit_rows
+                or time.monotonic() - self._oldest >= self._commit_interval
+            )
+        if due:
+            self.flush()
+
+    def flush(self):
+        with self._lock:
+            if not self._pending:
+                return
+            rows, self._pending = self._pending, []
+            try:
+                self._conn.execute("BEGIN")
+                self._conn.executemany(self._insert, rows)
+                self._conn.execute("COMMIT")
+            except Exception as e:
+                if self._conn.in_transaction:       # BEGIN itself may have failed
+                    self._conn.execute("ROLLBACK")
+                self._pending = rows + self._pending    # retry on next flush
+                log.warning(f"SqliteStore commit error: {e}")
+
+    def recent(self, since: float) -> list:
+        """(title, cluster_id, fetched_at as epoch) of rows fetched after `since`."""
+        cutoff = datetime.fromtimestamp(since, timezone.utc).isoformat()
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT title, cluster_id, fetched_at FROM news WHERE fetched_at >= ? ORDER BY fetched_at",
+                (cutoff,),
+            ).fetchall()
+        return [(t, c, datetime.fromisoformat(f).timestamp()) for t, c, f in rows]
+
+    def links(self) -> list:
+        """Every stored link (older rows may predate canonical links)."""
+        with self._lock:
+            return [r[0] for r in self._conn.execute("SELECT link FROM news")]
 
-        return []
+    def close(self):
+        self.flush()
+        self._conn.close()
+
+    def describe(self) -> str:
+        return f"SQLite → {os.path.abspath(self.path)}"
 
 
 # ══════════════════════════════════════════════════════════════════════
-# MODULE 7 – DATA WAREHOUSE  (CSV, incremental, thread-safe dedup)
+# MODULE 7c – DATA WAREHOUSE  (dedup via LinkIndex → storage backends)
 # ══════════════════════════════════════════════════════════════════════
 class DataWarehouse:
-    FIELDS = ["source", "news_type", "title", "link", "date", "fetched_at"]
+    """
+    Deduplicates against the LinkIndex and hands new rows to every backend:
+    SQLite (default primary) and/or the legacy CSV as an export.
+
+    Links are indexed as soon as they are handed over; with SQLite group
+    commit a crash can therefore lose at most the last `commit_interval`
+    seconds of rows, in exchange for one fsync per batch instead of per feed.
+
+    Every new item gets a `cluster_id` from the StoryClusterer, so the same
+    story arriving via CNBC, GNews and Bing shares one id. With
+    `suppress_near_dups=True` only the first copy of a story is stored (the
+    others are still indexed, so they are not re-processed next fetch).
+    """
+    FIELDS   = ["source", "news_type", "title", "link", "date", "fetched_at", "cluster_id", "raw_link"]
+    BACKENDS = ("sqlite", "csv")
 
-    def __init__(self, filename: str = "market_news_warehouse.csv"):
-        self.filename    = filename
-        self._lock       = threading.Lock()
-        self.seen_links: set = set()
+    def __init__(
+        self,
+        filename:   str  = "market_news_warehouse.csv",
+        index_file: str  = LinkIndex.DB_FILE,
+        backend:    str  = "sqlite",
+        csv_export: bool = True,
+        db_file:    str  = SqliteStore.DB_FILE,
+        suppress_near_dups: bool = False,
+    ):
+        if backend not in self.BACKENDS:
+            raise ValueError(f"backend must be one of {self.BACKENDS}, got {backend!r}")
+        self.filename = filename
+        self._lock    = ContendedLock("warehouse")
+        self.index    = LinkIndex(index_file)
+        self.clusters = StoryClusterer()
+        self.suppress_near_dups = suppress_near_dups
+        self.stores: list = []
+        if backend == "sqlite":
+            self.stores.append(SqliteStore(db_file, self.FIELDS))
+        if backend == "csv" or csv_export:
+            self.stores.append(CsvStore(filename, self.FIELDS))
         self._initialize()
 
     def _initialize(self):
-        if os.path.exists(self.filename):
-            with open(self.filename, "r", encoding="utf-8") as f:
-                for row in csv.DictReader(f):
-                    if "link" in row:
-                        self.seen_links.add(row["link"])
-            log.info(f"Warehouse: {len(self.seen_links):,} known links — {os.path.abspath(self.filename)}")
+        # No CSV rescan on start — only the first run ever back-fills the index
+        self.index.migrate_csv(self.filename)
+        sqlite = next((s for s in self.stores if isinstance(s, SqliteStore)), None)
+        if sqlite:
+            # Rows stored before links were canonicalised get their canonical keys once
+            self.index.backfill(sqlite.links(), "sqlite_canonical", sqlite.path)
+        log.info(f"Warehouse: {len(self.index):,} known links — {self.describe()}")
+        # Stories still inside the clustering window keep their ids across restarts
+        if sqlite:
+            self.clusters.warm(sqlite.recent(time.time() - StoryClusterer.WINDOW))
+
+    def __len__(self) -> int:
+        return len(self.index)
+
+    def describe(self) -> str:
+        return " + ".join(s.describe() for s in self.stores)
+
+    def is_known(self, link: str) -> bool:
+        """Raw or canonical link — dedup always happens on the canonical form."""
+        return LinkCanonicalizer.canonical(link) in self.index
+
+    def known_many(self, links: list) -> list:
+        """is_known() for a list of links in one index query."""
+        canon = [LinkCanonicalizer.canonical(l) for l in links]
+        new   = set(self.index.filter_new(canon))
+        return [c not in new for c in canon]
+
+    def story_stats(self, reset: bool = False) -> str:
+        return self.clusters.stats(reset)
 
     def save_batch(self, items: list) -> int:
         with self._lock:
-            new_items = [i for i in items if i.link not in self.seen_links]
-            if not new_items:
-                return 0
-            file_exists = os.path.isfile(self.filename)
-            with open(self.filename, "a", newline="", encoding="utf-8") as f:
-                writer = csv.DictWriter(f, fieldnames=self.FIELDS)
-                if not file_exists:
-                    writer.writeheader()
-                for item in new_items:
-                    writer.writerow(asdict(item))
-                    self.seen_links.add(item.link)
-            return len(new_items)
+            return self._store_new(self._unseen(items))
+
+    def unseen(self, items: list) -> list:
+        """Dedup step of save_batch on its own: items whose link isn't indexed yet."""
+        with self._lock:
+            return self._unseen(items)
+
+    def store_new(self, items: list) -> int:
+        """Write step of save_batch on its own, for items unseen() already let through."""
+        with self._lock:
+            return self._store_new(items)
+
+    def _unseen(self, items: list) -> list:
+        """Caller holds the lock."""
+        fresh     = set(self.index.filter_new([i.link for i in items]))
+        new_items = []
+        for item in items:
+            if item.link in fresh:
+                fresh.discard(item.link)        # first occurrence wins
+                new_items.append(item)
+        return new_items
+
+    def _store_new(self, new_items: list) -> int:
+        """Caller holds the lock. Cluster, write, then index every new link."""
+        if not new_items:
+            return 0
+        stored = []
+        for item in new_items:
+            item.cluster_id, is_new = self.clusters.assign(item.title)
+            if is_new or not self.suppress_near_dups:
+                stored.append(item)
+        rows = [asdict(i) for i in stored]
+        if rows:
+            for store in self.stores:
+                store.write(rows)
+        self.index.add_many(i.link for i in new_items)
+        return len(stored)
+
+    def flush(self):
+        with self._lock:
+            for store in self.stores:
+                store.flush()
+
+    def close(self):
+        with self._lock:
+            for store in self.stores:
+                store.close()
 
 
 # ══════════════════════════════════════════════════════════════════════
@@ -627,59 +3473,298 @@ class NewsEngine:
     Three-stage concurrent pipeline:
 
       Producer thread   → SourceManager.get_all_feeds() → work_queue
-      Worker threads    → WorkerPool.process_feed()      → result_queue
+      Worker threads    → WorkerPool.fetch_once()        → ParsePool
+      Parse processes   → StreamingFeedParser            → result_queue
       Drain thread      → DataWarehouse.save_batch()     → CSV on disk
 
     Workers begin fetching the MOMENT the producer pushes the first URL.
-    No waiting for the full feed list to be built first.
+    No waiting for the full feed list to be built first. A job that needs
+    another attempt goes back on the work queue's delay heap, carrying its
+    attempt count and backoff, and the worker moves straight on.
+
+    fetch_mode="async" swaps stage 2 for a single thread running an asyncio
+    loop (AsyncWorkerPool) with up to `max_concurrency` feeds in flight.
+
+    scheduling="adaptive" (default) keeps the pipeline running forever and
+    lets FeedScheduler release each feed when it is due; "cycle" is the
+    old refetch-everything-then-sleep loop.
     """
 
+    FETCH_MODES = ("threads", "async")
+    SCHEDULING  = ("adaptive", "cycle")
+    STATS_EVERY = 300      # seconds between summaries in adaptive mode
+
     def __init__(
         self,
-        max_workers:    int = 50,
-        cycle_min_wait: int = 90,
-        cycle_max_wait: int = 150,
+        max_workers:     int = 50,
+        cycle_min_wait:  int = 90,
+        cycle_max_wait:  int = 150,
+        fetch_mode:      str = "threads",
+        max_concurrency: int = 1000,
+        scheduling:      str = "adaptive",
+        batch_size:      int = 20,
+        storage:         str = "sqlite",
+        csv_export:      bool = True,
+        suppress_near_dups: bool = False,
+        parse_processes: int  = None,
+        shard:           "ShardClient" = None,
+        metrics_port:    int = None,
+        record_dir:      str = None,
     ):
-        self.max_workers = max_workers
-        self.min_wait    = cycle_min_wait
-        self.max_wait    = cycle_max_wait
+        if fetch_mode not in self.FETCH_MODES:
+            raise ValueError(f"fetch_mode must be one of {self.FETCH_MODES}, got {fetch_mode!r}")
+        if scheduling not in self.SCHEDULING:
+            raise ValueError(f"scheduling must be one of {self.SCHEDULING}, got {scheduling!r}")
+        self.max_workers     = max_workers
+        self.min_wait        = cycle_min_wait
+        self.max_wait        = cycle_max_wait
+        self.fetch_mode      = fetch_mode
+        self.max_concurrency = max_concurrency
+        self.scheduling      = scheduling
+        # Number of stage-2 consumers the producer / drain must signal
+        self._n_consumers    = max_workers if fetch_mode == "threads" else 1
 
         # Shared anti-block state — persists across cycles
         self.circuit     = CircuitBreaker()
         self.etag_cache  = ConditionalGetCache()
         self.limiter     = DomainLimiter(rate=1, window=2)
-        self.worker_pool = WorkerPool(self.limiter, self.circuit, self.etag_cache)
-        self.warehouse   = DataWarehouse()
+        # Starting point only — per-domain limits are learned from there
+        self.tuner       = DomainTuner(self.limiter.default_rate, WorkerPool.PER_DOMAIN)
+        # Sharded nodes dedup and store through the coordinator
+        self.shard       = shard
+        self._shard_epoch = None
+        self._feeds: dict = {}       # name → (url, category) of the current feed set
+        self.warehouse   = RemoteWarehouse(shard.url) if shard else DataWarehouse(
+            backend=storage, csv_export=csv_export, suppress_near_dups=suppress_near_dups
+        )
+        # Opt-in: keep the bodies we parse as a replay corpus (replay.py)
+        self.recorder    = ResponseRecorder(record_dir) if record_dir else None
+        self.worker_pool = WorkerPool(
+            self.limiter, self.circuit, self.etag_cache, self.warehouse.known_many, self.tuner, self.recorder
+        )
+        self.async_pool  = (
+            AsyncWorkerPool(
+                self.limiter, self.circuit, self.etag_cache, self.warehouse.known_many, self.tuner, self.recorder
+            )
+            if fetch_mode == "async" else None
+        )
+        # Parse stage: None → one process per core, 0 → parse on the fetch threads
+        if parse_processes is None:
+            parse_processes = os.cpu_count() or 1
+        self.parser      = ParsePool(parse_processes) if parse_processes > 0 else None
+        self.sources     = SourceManager(batch_size)
+        self.scheduler   = FeedScheduler()
+        self.health      = FeedHealth()
+        self.planner     = MakespanPlanner(self.limiter, self.circuit)
+        self._cycle_plan = None
+        # Learned limits, scaled down further while a domain's circuit recovers
+        self.tuner.add_listener(self._apply_tuning)
+        self.circuit.add_listener(self._apply_ramp)
+        # Stage timings / response counters for Prometheus; None or 0 → not served
+        if metrics_port:
+            metrics.serve(metrics_port)
+
+    def _apply_tuning(self, domain: str, rate: float, concurrency: int):
+        self.limiter.set_rate(domain, rate)
+        self._apply_concurrency(domain)
+
+    def _apply_ramp(self, domain: str, level: float):
+        self.limiter.set_scale(domain, level)
+        self._apply_concurrency(domain)
+
+    def _apply_concurrency(self, domain: str):
+        limit = max(1, round(self.tuner.concurrency(domain) * self.circuit.ramp(domain)))
+        for pool in (self.worker_pool, self.async_pool):
+            if pool is not None:
+                pool.set_concurrency(domain, limit)
+
+    def _my_feeds(self) -> dict:
+        """All feeds, or — in sharded mode — this node's slice, with domain budgets split."""
+        feeds = self._feeds = self.sources.get_all_feeds()
+        if not self.shard:
+            return feeds
+        nodes, epoch = self.shard.membership()
+        mine, shares = ShardMap.assign(feeds, nodes, self.shard.node_id)
+        for domain, fraction in shares.items():
+            self.limiter.set_share(domain, fraction)
+        self._shard_epoch = epoch
+        self._feeds = mine
+        log.info(
+            f"🧩 Shard {self.shard.node_id}: {len(mine):,} of {len(feeds):,} feeds, "
+            f"{len(shares):,} domain(s) | {len(nodes)} node(s), epoch {epoch}"
+        )
+        return mine
+
+    def domain_limits(self) -> dict:
+        """domain → learned rate / concurrency, with the breaker's state and ramp."""
+        limits = self.tuner.snapshot()
+        for domain, lim in limits.items():
+            lim["circuit"] = self.circuit.state(domain)
+            lim["ramp"]    = self.circuit.ramp(domain)
+        return limits
 
     # ── Stage 1: Producer ─────────────────────────────────────────────
-    def _producer(self, work_queue: Queue, total_ref: list):
+    def _producer(self, work_queue: DomainReadyQueue, total_ref: list):
         log.info("⚙️  Producer: building feed list…")
-        feeds = SourceManager().get_all_feeds()
+        feeds = self._my_feeds()
+        self.health.sync(feeds)
+        held  = len(feeds)
+        # Demoted / quarantined / retired feeds only go out when their re-test is due
+        feeds = {name: feed for name, feed in feeds.items() if self.health.should_fetch(name)}
+        held -= len(feeds)
         total_ref[0] = len(feeds)
-        log.info(f"⚙️  Producer: {len(feeds):,} feeds ready — streaming to workers now")
-        for name, (url, cat) in feeds.items():
-            work_queue.put((name, url, cat))
-        # One sentinel per worker so each thread knows when to stop
-        for _ in range(self.max_workers):
-            work_queue.put(_SENTINEL)
+        plan = self._cycle_plan = self.planner.plan(feeds, self._parallelism)
+        log.info(
+            f"⚙️  Producer: {len(feeds):,} feeds ready — streaming to workers now "
+            f"({held:,} held back by health: {self.health.stats()})"
+        )
+        log.info(
+            f"⚙️  Planner: predicted makespan {plan.makespan:,.0f}s — critical path "
+            f"{plan.critical_domain or '—'} ({plan.critical_feeds:,} feeds)"
+        )
+        for name, url, cat in plan.order:
+            work_queue.put(FetchJob(name, url, cat), url)
+        # Consumers receive _SENTINEL once every parked feed is handed out
+        work_queue.close()
         log.info("⚙️  Producer: done.")
 
+    # ── Stage 1 (adaptive mode): release feeds as they fall due ───────
+    def _scheduled_producer(self, work_queue: DomainReadyQueue, stop: threading.Event):
+        feeds = self._my_feeds()
+        self.scheduler.sync(feeds)
+        self.health.sync(feeds)
+        log.info(f"⚙️  Scheduler: {self.scheduler.stats()}")
+        log.info(f"⚙️  Health: {self.health.stats()}")
+        while not stop.is_set():
+            if self.shard and self.shard.epoch != self._shard_epoch:
+                # A node joined or left — take up the new slice
+                feeds = self._my_feeds()
+                self.scheduler.sync(feeds)
+                self.health.sync(feeds)
+            due, probing = {}, set()
+            for name in self.scheduler.pop_due():
+                if name not in feeds:       # moved to another node since it was scheduled
+                    continue
+                url, cat = feeds[name]
+                domain   = WorkerPool._domain(url)
+                state    = self.circuit.state(domain)
+                # Don't learn "zero yield" from a domain we aren't allowed to hit;
+                # a half-open domain gets exactly one feed through as its probe
+                if state == "open":
+                    self.scheduler.postpone(name, max(self.scheduler.floor(name), self.circuit.retry_in(domain)))
+                    continue
+                if state == "probing" or (state == "half_open" and domain in probing):
+                    self.scheduler.postpone(name, self.scheduler.floor(name))
+                    continue
+                # Held-back feeds wait for their re-test instead of their learned interval
+                if not self.health.should_fetch(name):
+                    self.scheduler.postpone(name, max(self.scheduler.floor(name), self.health.retest_in(name)))
+                    continue
+                if state == "half_open":
+                    probing.add(domain)
+                due[name] = (url, cat)
+            if due:
+                plan = self.planner.plan(due, self._parallelism)
+                for name, url, cat in plan.order:
+                    work_queue.put(FetchJob(name, url, cat), url)
+                log.info(
+                    f"⚙️  Scheduler: {len(due):,} feed(s) due — {len(work_queue):,} parked | "
+                    f"predicted makespan {plan.makespan:,.0f}s ({plan.critical_domain})"
+                )
+            # Re-check at least every 5s: in-flight feeds get rescheduled meanwhile
+            stop.wait(min(max(self.scheduler.seconds_until_next(), 1.0), 5.0))
+        work_queue.close()
+
     # ── Stage 2: Worker ───────────────────────────────────────────────
-    def _worker(self, work_queue: Queue, result_queue: Queue):
+    def _worker(self, work_queue: DomainReadyQueue, result_queue: Queue):
         while True:
-            item = work_queue.get()
+            item = work_queue.get()           # only returns feeds whose domain has a token
             if item is _SENTINEL:
-                work_queue.task_done()
+                if self.parser:
+                    self.parser.wait_idle()   # parsed results must reach the drain first
                 result_queue.put(_SENTINEL)   # notify drain this worker finished
                 break
-            name, url, cat = item
             try:
-                results = self.worker_pool.process_feed(name, url, cat)
+                result = self.worker_pool.fetch_once(
+                    item, rate_token=True,
+                    max_entries=self.sources.max_entries(item.name),
+                    stop_at_known=self.sources.chronological(item.url),
+                    parse=self.parser is None,
+                )
+            except Exception as exc:
+                log.debug(f"Worker unhandled error [{item.name}]: {exc}")
+                result = FetchResult([])
+            self._finish(work_queue, result_queue, item, result)
+
+    def _finish(self, work_queue: DomainReadyQueue, result_queue: Queue, job: FetchJob, result: FetchResult):
+        """
+        Hand a finished job to the drain — via the parse stage if its body
+        still needs parsing — or park its retry; the worker never sleeps it out.
+        May block on parse-stage backpressure.
+        """
+        if result.status is not None:
+            metrics.response(WorkerPool._domain(job.url), result.status)
+        if result.retry_in is not None:
+            work_queue.put_later(job.retry(), job.url, result.retry_in)
+        elif result.body is not None:
+            def parsed(items, job=job, result=result):
+                result.items, result.body = items, None
+                result_queue.put((job.name, result))
+            self.parser.submit(
+                job.name, job.cat, result.body, self.sources.max_entries(job.name),
+                self.sources.chronological(job.url), parsed,
+            )
+        else:
+            result_queue.put((job.name, result))
+        work_queue.task_done()
+
+    # ── Stage 2 (async mode): one event loop, many in-flight feeds ────
+    def _async_fetcher(self, work_queue: DomainReadyQueue, result_queue: Queue):
+        try:
+            asyncio.run(self._async_fetch_all(work_queue, result_queue))
+        except Exception as exc:
+            log.error(f"Async fetcher crashed: {exc}")
+        if self.parser:
+            self.parser.wait_idle()
+        result_queue.put(_SENTINEL)   # notify drain the fetcher finished
+
+    async def _async_fetch_all(self, work_queue: DomainReadyQueue, result_queue: Queue):
+        loop     = asyncio.get_running_loop()
+        inflight = asyncio.Semaphore(self.max_concurrency)
+        tasks    = set()
+
+        async def fetch(http, job):
+            try:
+                result = await self.async_pool.fetch_once(
+                    http, job, rate_token=True,
+                    max_entries=self.sources.max_entries(job.name),
+                    stop_at_known=self.sources.chronological(job.url),
+                    parse=self.parser is None,
+                )
             except Exception as exc:
-                log.debug(f"Worker unhandled error [{name}]: {exc}")
-                results = []
-            result_queue.put((name, results))
-            work_queue.task_done()
+                log.debug(f"Async unhandled error [{job.name}]: {exc}")
+                result = FetchResult([])
+            finally:
+                inflight.release()
+            if result.body is not None:
+                # Parse-stage backpressure blocks — keep it off the event loop
+                await loop.run_in_executor(None, self._finish, work_queue, result_queue, job, result)
+            else:
+                self._finish(work_queue, result_queue, job, result)
+
+        connector = aiohttp.TCPConnector(limit=self.max_concurrency, ttl_dns_cache=300)
+        async with aiohttp.ClientSession(connector=connector) as http:
+            while True:
+                # Blocking get() runs in the executor so the loop keeps spinning
+                item = await loop.run_in_executor(None, work_queue.get)
+                if item is _SENTINEL:
+                    break
+                await inflight.acquire()
+                task = asyncio.create_task(fetch(http, item))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+            if tasks:
+                await asyncio.gather(*tasks)
 
     # ── Stage 3: Drain ────────────────────────────────────────────────
     def _drain(self, result_queue: Queue, total_ref: list, cycle_start: datetime):
@@ -687,7 +3772,7 @@ class NewsEngine:
         saved_total  = 0
         workers_done = 0
 
-        while workers_done < self.max_workers:
+        while workers_done < self._n_consumers:
             item = result_queue.get()
 
             if item is _SENTINEL:
@@ -695,12 +3780,10 @@ class NewsEngine:
                 result_queue.task_done()
                 continue
 
-            name, results = item
-            if results:
-                saved = self.warehouse.save_batch(results)
-                saved_total += saved
-            else:
-                saved = 0
+            name, result = item
+            results = result.items
+            saved   = self._store(name, result)
+            saved_total += saved
 
             completed += 1
             total   = total_ref[0] or "?"
@@ -713,29 +3796,136 @@ class NewsEngine:
             )
             result_queue.task_done()
 
-        # Flush ETag cache to disk at end of cycle
-        self.etag_cache.flush()
+        self._flush()
 
         elapsed = int((datetime.now(timezone.utc) - cycle_start).total_seconds())
         log.info("─" * 70)
+        if self._cycle_plan is not None:
+            plan = self._cycle_plan
+            log.info(
+                f"⏱  Makespan: predicted {plan.makespan:,.0f}s | actual {elapsed:,}s | "
+                f"critical path {plan.critical_domain or '—'} ({plan.critical_feeds:,} feeds)"
+            )
         log.info(
             f"✅ Cycle complete | {saved_total:,} new articles | "
-            f"DB: {len(self.warehouse.seen_links):,} total | "
+            f"DB: {len(self.warehouse):,} total | "
             f"Circuit: {self.circuit.stats()} | "
             f"{elapsed}s"
         )
+        log.info(f"   Cache: {self.etag_cache.stats(reset=True)}")
+        log.info(f"   Limits: {self.tuner.stats()}")
+        log.info(f"   Health: {self.health.stats()}")
+        log.info(f"   Stories: {self.warehouse.story_stats(reset=True)}")
         log.info("─" * 70)
 
+    def _flush(self):
+        """ETag cache + breaker + pending rows + learned schedule / health / limits → disk."""
+        started = time.perf_counter()
+        self.etag_cache.flush()
+        self.circuit.flush()
+        self.warehouse.flush()
+        self.scheduler.save()
+        self.health.save()
+        self.tuner.save()
+        if self.recorder:
+            self.recorder.flush()
+        metrics.stage("flush", time.perf_counter() - started)
+
+    def _store(self, name: str, result: FetchResult) -> int:
+        """Persist one feed's items and feed the yield back to the scheduler and health registry."""
+        started = time.perf_counter()
+        results = self.sources.attribute(name, result.items)   # batched feed → per-ticker source
+        saved   = self.warehouse.save_batch(results) if results else 0
+        metrics.stage("store", time.perf_counter() - started)
+        if saved:
+            metrics.inc("marketpulse_items_saved_total", saved)
+        if result.status is None:
+            # Not fetched (circuit skip, worker error): release the feed from the
+            # scheduler without counting an empty result against its yield
+            wait = self.scheduler.floor(name)
+            if name in self._feeds:
+                wait = max(wait, self.circuit.retry_in(WorkerPool._domain(self._feeds[name][0])))
+            self.scheduler.postpone(name, wait)
+            return saved
+        self.scheduler.record(name, saved)
+        self.health.record(name, result, saved)
+        return saved
+
+    # ── Stage 3 (adaptive mode): drain forever, summarise periodically ─
+    def _continuous_drain(self, result_queue: Queue):
+        workers_done = 0
+        fetched = saved_total = 0
+        window_start = time.monotonic()
+
+        while workers_done < self._n_consumers:
+            try:
+                item = result_queue.get(timeout=5)
+            except Empty:
+                item = None
+                self.warehouse.flush()      # idle → commit whatever is pending
+
+            if item is _SENTINEL:
+                workers_done += 1
+            elif item is not None:
+                name, result = item
+                saved = self._store(name, result)
+                fetched     += 1
+                saved_total += saved
+                if saved:
+                    log.info(f"  ✓ {name[:48]:<48} | +{saved:>2} new")
+
+            elapsed = time.monotonic() - window_start
+            if elapsed >= self.STATS_EVERY or workers_done == self._n_consumers:
+                self._flush()
+                log.info("─" * 70)
+                log.info(
+                    f"📈 Last {elapsed:.0f}s | {fetched:,} fetches "
+                    f"({fetched * 3600 / max(elapsed, 1):,.0f}/h) | {saved_total:,} new | "
+                    f"DB: {len(self.warehouse):,} total | "
+                    f"Circuit: {self.circuit.stats()}"
+                )
+                log.info(f"   Schedule: {self.scheduler.stats()}")
+                log.info(f"   Health: {self.health.stats()}")
+                log.info(f"   Stories: {self.warehouse.story_stats(reset=True)}")
+                log.info(f"   Cache: {self.etag_cache.stats(reset=True)}")
+                log.info(f"   Limits: {self.tuner.stats()}")
+                log.info("─" * 70)
+                fetched = saved_total = 0
+                window_start = time.monotonic()
+
+    @property
+    def _parallelism(self) -> int:
+        return self.max_concurrency if self.fetch_mode == "async" else self.max_workers
+
+    # ── Stage 2 thread factory (shared by both scheduling modes) ──────
+    def _fetch_threads(self, work_queue: DomainReadyQueue, result_queue: Queue) -> list:
+        if self.fetch_mode == "async":
+            return [
+                threading.Thread(
+                    target=self._async_fetcher, args=(work_queue, result_queue),
+                    daemon=True, name="AsyncFetcher"
+                )
+            ]
+        return [
+            threading.Thread(
+                target=self._worker, args=(work_queue, result_queue),
+                daemon=True, name=f"Worker-{i}"
+            )
+            for i in range(self.max_workers)
+        ]
+
     # ── Orchestrator ──────────────────────────────────────────────────
     def _run_cycle(self):
         cycle_start = datetime.now(timezone.utc)
         log.info("═" * 70)
         log.info(f"🚀 Cycle started | {cycle_start.strftime('%Y-%m-%d %H:%M:%S')} UTC")
-        log.info(f"   CSV    → {os.path.abspath(self.warehouse.filename)}")
+        log.info(f"   Store  → {self.warehouse.describe()}")
         log.info(f"   Circuit: {self.circuit.stats()}")
         log.info("═" * 70)
 
-        work_queue   = Queue(maxsize=200)   # backpressure so producer doesn't flood RAM
+        # Unbounded on purpose: a bound would let one throttled domain's backlog
+        # block the producer from reaching feeds for idle domains
+        work_queue   = DomainReadyQueue(self.limiter)
         result_queue = Queue()
         total_ref    = [0]                  # mutable container so drain can read final count
 
@@ -743,13 +3933,7 @@ class NewsEngine:
             target=self._producer, args=(work_queue, total_ref),
             daemon=True, name="Producer"
         )
-        worker_threads = [
-            threading.Thread(
-                target=self._worker, args=(work_queue, result_queue),
-                daemon=True, name=f"Worker-{i}"
-            )
-            for i in range(self.max_workers)
-        ]
+        worker_threads = self._fetch_threads(work_queue, result_queue)
         drain_thread = threading.Thread(
             target=self._drain, args=(result_queue, total_ref, cycle_start),
             daemon=True, name="Drain"
@@ -766,14 +3950,67 @@ class NewsEngine:
             w.join()
         drain_thread.join()
 
+    def _run_continuous(self):
+        """Adaptive mode: one long-lived pipeline, fed by FeedScheduler."""
+        work_queue   = DomainReadyQueue(self.limiter)
+        result_queue = Queue()
+        stop         = threading.Event()
+
+        prod_thread = threading.Thread(
+            target=self._scheduled_producer, args=(work_queue, stop),
+            daemon=True, name="Producer"
+        )
+        worker_threads = self._fetch_threads(work_queue, result_queue)
+        drain_thread = threading.Thread(
+            target=self._continuous_drain, args=(result_queue,),
+            daemon=True, name="Drain"
+        )
+
+        drain_thread.start()
+        prod_thread.start()
+        for w in worker_threads:
+            w.start()
+
+        try:
+            while drain_thread.is_alive():
+                drain_thread.join(timeout=1)
+        except KeyboardInterrupt:
+            log.info("🛑 Stopping — letting in-flight feeds finish…")
+            stop.set()
+            for w in worker_threads:
+                w.join()
+            drain_thread.join()
+        if self.parser:
+            self.parser.close()
+        if self.recorder:
+            self.recorder.close()
+
     # ── 24/7 loop ────────────────────────────────────────────────────
     def start(self):
         log.info("═" * 70)
         log.info("  MarketPulse News Engine v3.0")
-        log.info(f"  Workers : {self.max_workers}")
-        log.info(f"  Cycle   : every {self.min_wait}–{self.max_wait}s")
+        if self.fetch_mode == "async":
+            log.info(f"  Fetch   : async — up to {self.max_concurrency} in flight")
+        else:
+            log.info(f"  Workers : {self.max_workers}")
+        if self.parser:
+            log.info(f"  Parse   : {self.parser.processes} process(es)")
+        else:
+            log.info("  Parse   : on the fetch threads")
+        if self.scheduling == "adaptive":
+            log.info("  Schedule: adaptive per-feed (FeedScheduler)")
+        else:
+            log.info(f"  Cycle   : every {self.min_wait}–{self.max_wait}s")
+        if self.recorder:
+            log.info(f"  Record  : responses → {self.recorder.directory}")
+        # Stacks + lock contention of the live process, without a restart
+        profiler.install(metrics)
+        log.info(f"  Profile : kill -USR1 {os.getpid()} or GET /debug/profile on the metrics port")
         log.info(f"  Files   : {os.getcwd()}")
         log.info("═" * 70)
+        if self.scheduling == "adaptive":
+            self._run_continuous()
+            return
         while True:
             self._run_cycle()
             wait = random.randint(self.min_wait, self.max_wait)
@@ -781,13 +4018,326 @@ class NewsEngine:
             time.sleep(wait)
 
 
+# ══════════════════════════════════════════════════════════════════════
+# MODULE 9 – SHARDED MODE  (rendezvous hashing, local coordinator, remote sink)
+# ══════════════════════════════════════════════════════════════════════
+class ShardMap:
+    """
+    Splits the feed list across nodes with rendezvous (highest-random-weight)
+    hashing, by domain first.
+
+    Each domain goes to the node(s) that score highest for it. A domain with
+    more than SPLIT_FEEDS feeds is spread over ceil(n / SPLIT_FEEDS) nodes and
+    its feeds are divided among them by feed name; every holder then runs
+    the domain at 1/k of its rate, so the per-domain budget adds up to what
+    one node would have used. When a node joins or leaves, only the domains
+    (and feeds) whose top scorer changed move.
+    """
+    SPLIT_FEEDS = 200
+
+    @staticmethod
+    def _score(node: str, key: str) -> int:
+        return int.from_bytes(hashlib.blake2b(f"{node}|{key}".encode(), digest_size=8).digest(), "big")
+
+    @classmethod
+    def assign(cls, feeds: dict, nodes: list, me: str) -> tuple:
+        """→ ({name: (url, cat)} owned by `me`, {domain: rate fraction} for those feeds)."""
+        if not nodes:
+            nodes = [me]
+        by_domain: dict = defaultdict(list)
+        for name, (url, cat) in feeds.items():
+            by_domain[DomainLimiter._domain(url)].append(name)
+
+        mine, shares = {}, {}
+        for domain, names in by_domain.items():
+            k = min(len(nodes), math.ceil(len(names) / cls.SPLIT_FEEDS))
+            holders = sorted(nodes, key=lambda n: cls._score(n, domain), reverse=True)[:k]
+            if me not in holders:
+                continue
+            for name in names:
+                if k == 1 or max(holders, key=lambda n: cls._score(n, name)) == me:
+                    mine[name] = feeds[name]
+            shares[domain] = 1.0 / k
+        return mine, shares
+
+
+def _post_json(url: str, payload: dict = None, timeout: float = 10.0) -> dict:
+    data = json.dumps(payload or {}).encode()
+    req  = urllib.request.Request(url, data=data, headers={"Content-Type": "application/json"})
+    with urllib.request.urlopen(req, timeout=timeout) as resp:
+        return json.loads(resp.read() or b"{}")
+
+
+class Coordinator:
+    """
+    Local stand-in for the cluster: node membership plus the shared dedup
+    and storage sink (one DataWarehouse), over plain HTTP + JSON.
+
+      POST /join | /heartbeat | /leave  {"node"}  → {"nodes", "epoch"}
+      POST /known  {"links": [...]}                → {"known": [bool, ...]}
+      POST /save   {"items": [NewsItem dicts]}     → {"saved": n}
+      GET  /stats                                  → {"links", "nodes", "epoch"}
+
+    A node that misses heartbeats for NODE_TTL seconds is dropped; every
+    membership change bumps `epoch`, which tells nodes to re-slice.
+    """
+    NODE_TTL = 15.0
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 8765, **warehouse_kwargs):
+        self.warehouse = DataWarehouse(**warehouse_kwargs)
+        self._nodes: dict = {}       # node id → monotonic last heartbeat
+        self._epoch = 0
+        self._lock  = threading.Lock()
+        self.server = ThreadingHTTPServer((host, port), self._handler())
+        self.server.daemon_threads = True
+
+    @property
+    def url(self) -> str:
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def _membership(self) -> dict:
+        """Caller holds the lock."""
+        return {"nodes": sorted(self._nodes), "epoch": self._epoch}
+
+    def _touch(self, node: str, alive: bool = True) -> dict:
+        with self._lock:
+            known = node in self._nodes
+            if alive:
+                self._nodes[node] = time.monotonic()
+            else:
+                self._nodes.pop(node, None)
+            if known != alive:
+                self._epoch += 1
+                log.info(f"🧩 Node {node} {'joined' if alive else 'left'} — {len(self._nodes)} node(s), epoch {self._epoch}")
+            return self._membership()
+
+    def _reap(self):
+        while True:
+            time.sleep(self.NODE_TTL / 3)
+            now = time.monotonic()
+            with self._lock:
+                stale = [n for n, seen in self._nodes.items() if now - seen > self.NODE_TTL]
+            for node in stale:
+                log.warning(f"🧩 Node {node} missed its heartbeats")
+                self._touch(node, alive=False)
+            self.warehouse.flush()
+
+    def _handler(self):
+        coordinator = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def _reply(self, body: dict, code: int = 200):
+                data = json.dumps(body).encode()
+                self.send_response(code)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def do_GET(self):
+                if self.path != "/stats":
+                    return self._reply({"error": "not found"}, 404)
+                with coordinator._lock:
+                    body = coordinator._membership()
+                body["links"] = len(coordinator.warehouse)
+                self._reply(body)
+
+            def do_POST(self):
+                try:
+                    length  = int(self.headers.get("Content-Length", 0))
+                    payload = json.loads(self.rfile.read(length) or b"{}")
+                    if self.path in ("/join", "/heartbeat"):
+                        return self._reply(coordinator._touch(payload["node"]))
+                    if self.path == "/leave":
+                        return self._reply(coordinator._touch(payload["node"], alive=False))
+                    if self.path == "/known":
+                        known = coordinator.warehouse.known_many(payload["links"])
+                        return self._reply({"known": known})
+                    if self.path == "/save":
+                        items = [NewsItem(**d) for d in payload["items"]]
+                        return self._reply({"saved": coordinator.warehouse.save_batch(items)})
+                    self._reply({"error": "not found"}, 404)
+                except Exception as exc:
+                    log.warning(f"Coordinator {self.path} error: {exc}")
+                    self._reply({"error": str(exc)}, 500)
+
+        return Handler
+
+    def serve_forever(self):
+        threading.Thread(target=self._reap, daemon=True, name="CoordinatorReaper").start()
+        log.info(f"🧩 Coordinator on {self.url} — {self.warehouse.describe()}")
+        try:
+            self.server.serve_forever()
+        except KeyboardInterrupt:
+            log.info("🛑 Coordinator stopping…")
+        finally:
+            self.server.server_close()
+            self.warehouse.close()
+
+
+class ShardClient:
+    """A node's view of the cluster: joins, heartbeats, tracks membership / epoch."""
+    HEARTBEAT = 5.0
+
+    def __init__(self, url: str, node_id: str = None):
+        self.url     = url.rstrip("/")
+        self.node_id = node_id or f"{socket.gethostname()}-{os.getpid()}"
+        self._nodes  = [self.node_id]
+        self.epoch   = None
+        self._lock   = threading.Lock()
+
+    def _update(self, reply: dict):
+        with self._lock:
+            self._nodes = reply["nodes"] or [self.node_id]
+            self.epoch  = reply["epoch"]
+
+    def membership(self) -> tuple:
+        with self._lock:
+            return list(self._nodes), self.epoch
+
+    def join(self, attempts: int = 30):
+        for attempt in range(attempts):
+            try:
+                self._update(_post_json(f"{self.url}/join", {"node": self.node_id}))
+                break
+            except OSError as exc:
+                log.warning(f"🧩 Coordinator {self.url} not reachable ({exc}) — retrying")
+                time.sleep(min(2 ** attempt, 10))
+        else:
+            raise RuntimeError(f"could not join coordinator at {self.url}")
+        threading.Thread(target=self._heartbeat, daemon=True, name="ShardHeartbeat").start()
+        log.info(f"🧩 Joined {self.url} as {self.node_id} — {len(self._nodes)} node(s)")
+
+    def _heartbeat(self):
+        while True:
+            time.sleep(self.HEARTBEAT)
+            try:
+                self._update(_post_json(f"{self.url}/heartbeat", {"node": self.node_id}))
+            except OSError as exc:
+                log.warning(f"🧩 Heartbeat failed: {exc}")
+
+    def leave(self):
+        try:
+            _post_json(f"{self.url}/leave", {"node": self.node_id}, timeout=3)
+        except OSError:
+            pass
+
+
+class RemoteWarehouse:
+    """
+    DataWarehouse stand-in for sharded nodes: dedup and storage happen on
+    the coordinator. Links known to be stored are cached locally (they
+    never become unknown again); batches the coordinator could not take
+    are kept and re-sent on the next save or flush.
+    """
+    KNOWN_CACHE = 100_000
+
+    def __init__(self, url: str):
+        self.url      = url.rstrip("/")
+        self._known: set  = set()
+        self._backlog: list = []
+        self._count   = 0
+        self._lock    = threading.Lock()
+
+    def __len__(self) -> int:
+        try:
+            with urllib.request.urlopen(f"{self.url}/stats", timeout=5) as resp:
+                self._count = json.loads(resp.read())["links"]
+        except (OSError, ValueError, KeyError):
+            pass
+        return self._count
+
+    def describe(self) -> str:
+        return f"Coordinator → {self.url}"
+
+    def story_stats(self, reset: bool = False) -> str:
+        return "clustered on the coordinator"
+
+    def is_known(self, link: str) -> bool:
+        return self.known_many([link])[0]
+
+    def known_many(self, links: list) -> list:
+        """One coordinator round-trip for every link not already cached as known."""
+        canon = [LinkCanonicalizer.canonical(l) for l in links]
+        ask   = list(dict.fromkeys(c for c in canon if c not in self._known))
+        if ask:
+            try:
+                answers = _post_json(f"{self.url}/known", {"links": ask})["known"]
+            except (OSError, ValueError, KeyError):
+                answers = [False] * len(ask)     # worst case the coordinator dedups them
+            found = [link for link, known in zip(ask, answers) if known]
+            if found:
+                if len(self._known) + len(found) > self.KNOWN_CACHE:
+                    self._known.clear()
+                self._known.update(found)
+        return [c in self._known for c in canon]
+
+    def save_batch(self, items: list) -> int:
+        with self._lock:
+            batch, self._backlog = self._backlog + [asdict(i) for i in items], []
+            try:
+                saved = _post_json(f"{self.url}/save", {"items": batch})["saved"]
+            except (OSError, ValueError, KeyError) as exc:
+                log.warning(f"RemoteWarehouse: {len(batch)} item(s) kept for retry — {exc}")
+                self._backlog = batch
+                return 0
+            for row in batch:
+                self._known.add(row["link"])
+            return saved
+
+    def flush(self):
+        if self._backlog:
+            self.save_batch([])
+
+    def close(self):
+        self.flush()
+
+
 # ══════════════════════════════════════════════════════════════════════
 # ENTRY POINT
 # ══════════════════════════════════════════════════════════════════════
 if __name__ == "__main__":
-    engine = NewsEngine(
-        max_workers    = 50,
-        cycle_min_wait = 90,
-        cycle_max_wait = 150,
-    )
-    engine.start()
\ No newline at end of file
+    cli = argparse.ArgumentParser(description="MarketPulse News Engine")
+    cli.add_argument("role", nargs="?", default="standalone", choices=("standalone", "coordinator", "node"))
+    cli.add_argument("--host", default="127.0.0.1", help="coordinator: listen address")
+    cli.add_argument("--port", type=int, default=8765, help="coordinator: listen port")
+    cli.add_argument("--coordinator", default="http://127.0.0.1:8765", help="node: coordinator URL")
+    cli.add_argument("--node-id", default=None, help="node: stable id (default host-pid)")
+    cli.add_argument("--workdir", default=None, help="directory for this instance's state files")
+    cli.add_argument("--metrics-port", type=int, default=9108, help="Prometheus /metrics port, 0 = off")
+    cli.add_argument("--record", default=None, metavar="DIR", help="save parsed responses as a replay corpus")
+    args = cli.parse_args()
+    if args.workdir:
+        os.makedirs(args.workdir, exist_ok=True)
+        os.chdir(args.workdir)
+
+    if args.role == "coordinator":
+        Coordinator(args.host, args.port).serve_forever()
+    else:
+        shard = ShardClient(args.coordinator, args.node_id) if args.role == "node" else None
+        if shard:
+            shard.join()
+        engine = NewsEngine(
+            max_workers    = 50,
+            cycle_min_wait = 90,
+            cycle_max_wait = 150,
+            fetch_mode     = "threads",   # "async" → AsyncWorkerPool (needs aiohttp)
+            scheduling     = "adaptive",  # "cycle"  → refetch everything every 90–150s
+            storage        = "sqlite",    # "csv" → CSV only
+            csv_export     = True,        # keep appending market_news_warehouse.csv too
+            suppress_near_dups = False,   # True → store only the first copy of each story
+            parse_processes = None,       # None → one per core, 0 → parse on the fetch threads
+            batch_size     = 20,          # symbols per combined search feed (1 = per-symbol)
+            shard          = shard,       # node → slice of the feeds, coordinator dedups/stores
+            metrics_port   = args.metrics_port,  # GET /metrics — stage histograms, per-domain status
+            record_dir     = args.record,  # corpus for replay.py — None → off
+        )
+        try:
+            engine.start()
+        finally:
+            if shard:
+                shard.leave()
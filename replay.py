@@ -0,0 +1,160 @@
+"""
+MarketPulse Replay - parse/store microbenchmark on a recorded corpus
+Loads responses captured with `main.py --record DIR` (ResponseRecorder)
+and pushes them straight through the engine's own stages, no network:
+
+    parse        StreamingFeedParser.parse
+    canonicalize WorkerPool._to_items (LinkCanonicalizer.canonical → NewsItem)
+    dedup        DataWarehouse.unseen (LinkIndex.filter_new)
+    store        DataWarehouse.store_new (clustering, backend write, index update)
+    flush        DataWarehouse.flush (group commit) once per pass
+
+These are the two halves of _build_items and save_batch, so each piece of
+work is timed exactly once.
+
+Pass 1 ingests into an empty warehouse; later passes see only known links,
+i.e. the steady-state refetch path. Same corpus + flags → comparable numbers.
+
+    python replay.py corpus/ --passes 2 --json run.json
+    python replay.py corpus/ --baseline run.json
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+import logging
+
+from bench import percentile
+
+
+def replay_pass(engine_mod, warehouse, records: list, max_entries: int) -> dict:
+    """One pass over the corpus → {stage: [seconds per feed]} plus counters."""
+    parse    = engine_mod.StreamingFeedParser.parse
+    to_items = engine_mod.WorkerPool._to_items
+    timings = {s: [] for s in ("parse", "canonicalize", "dedup", "store")}
+    items_total = saved_total = 0
+    clock = time.perf_counter
+
+    for rec in records:
+        t0 = clock()
+        entries, _ = parse(rec["body"], max_entries)
+        t1 = clock()
+        items = to_items(rec["name"], rec["cat"], entries)
+        t2 = clock()
+        fresh = warehouse.unseen(items) if items else []
+        t3 = clock()
+        saved = warehouse.store_new(fresh)
+        t4 = clock()
+        timings["parse"].append(t1 - t0)
+        timings["canonicalize"].append(t2 - t1)
+        timings["dedup"].append(t3 - t2)
+        timings["store"].append(t4 - t3)
+        items_total += len(items)
+        saved_total += saved
+
+    started = clock()
+    warehouse.flush()
+    timings["flush"] = [clock() - started]
+    return {"timings": timings, "items": items_total, "saved": saved_total}
+
+
+def summarise(result: dict, records: list, nbytes: int) -> dict:
+    timings = result["timings"]
+    total   = sum(sum(v) for v in timings.values())
+    stages  = {
+        stage: {
+            "total_s": round(sum(v), 4),
+            "mean_us": round(sum(v) / len(v) * 1e6, 1) if v else 0.0,
+            "p50_us":  round(percentile(v, 50) * 1e6, 1),
+            "p99_us":  round(percentile(v, 99) * 1e6, 1),
+        }
+        for stage, v in timings.items()
+    }
+    return {
+        "seconds":     round(total, 3),
+        "feeds_per_s": round(len(records) / total, 1) if total else 0.0,
+        "items_per_s": round(result["items"] / total, 1) if total else 0.0,
+        "mb_per_s":    round(nbytes / 1e6 / total, 2) if total else 0.0,
+        "items":       result["items"],
+        "saved":       result["saved"],
+        "stages":      stages,
+    }
+
+
+def main():
+    cli = argparse.ArgumentParser(description="Replay a recorded response corpus through parse → store")
+    cli.add_argument("corpus", help="corpus directory or a single .jsonl.gz file")
+    cli.add_argument("--passes",      type=int, default=2)
+    cli.add_argument("--max-entries", type=int, default=5, help="entries kept per feed, as in production")
+    cli.add_argument("--limit",       type=int, default=0, help="use only the first N responses")
+    cli.add_argument("--storage",     default="sqlite", choices=("sqlite", "csv"))
+    cli.add_argument("--workdir",     default=None, help="warehouse location (default: fresh temp dir)")
+    cli.add_argument("--json",        default=None, help="write the results here")
+    cli.add_argument("--baseline",    default=None, help="earlier --json output to compare against")
+    cli.add_argument("--verbose",     action="store_true", help="engine log on the console too")
+    args = cli.parse_args()
+
+    corpus   = os.path.abspath(args.corpus)
+    json_out = os.path.abspath(args.json) if args.json else None
+    baseline = None
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+
+    # The warehouse (and engine.log) live in the workdir — never the production files
+    workdir = os.path.abspath(args.workdir or tempfile.mkdtemp(prefix="marketpulse-replay-"))
+    os.makedirs(workdir, exist_ok=True)
+    sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+    os.chdir(workdir)
+    import main as engine_mod
+    if not args.verbose:
+        for handler in list(logging.getLogger().handlers):
+            if type(handler) is logging.StreamHandler:
+                logging.getLogger().removeHandler(handler)
+
+    # Decompress + decode up front: only the engine stages are timed
+    records = []
+    for rec in engine_mod.ResponseRecorder.read(corpus):
+        if rec.get("status") == 200 and rec.get("body"):
+            records.append(rec)
+            if args.limit and len(records) >= args.limit:
+                break
+    if not records:
+        sys.exit(f"replay: no usable responses in {corpus}")
+    nbytes = sum(len(r["body"].encode()) for r in records)
+    print(f"replay: {len(records):,} responses, {nbytes / 1e6:,.1f} MB | {args.storage} | workdir {workdir}")
+
+    warehouse = engine_mod.DataWarehouse(backend=args.storage, csv_export=False)
+    engine_mod.LinkCanonicalizer.canonical.cache_clear()      # pass 1 starts cold
+    passes = []
+    for n in range(1, args.passes + 1):
+        summary = summarise(replay_pass(engine_mod, warehouse, records, args.max_entries), records, nbytes)
+        passes.append(summary)
+        print(
+            f"  pass {n}: {summary['seconds']:>8.3f}s | {summary['feeds_per_s']:>9,.1f} feeds/s | "
+            f"{summary['items_per_s']:>9,.1f} items/s | {summary['mb_per_s']:>7.2f} MB/s | "
+            f"saved {summary['saved']:,}"
+        )
+        for stage, st in summary["stages"].items():
+            line = (
+                f"      {stage:<12} {st['total_s']:>9.4f}s | mean {st['mean_us']:>9.1f} µs | "
+                f"p50 {st['p50_us']:>9.1f} µs | p99 {st['p99_us']:>9.1f} µs"
+            )
+            if baseline and n <= len(baseline["passes"]):
+                before = baseline["passes"][n - 1]["stages"].get(stage, {}).get("total_s")
+                if before:
+                    line += f" | {(st['total_s'] - before) / before:+.1%} vs baseline"
+            print(line)
+    warehouse.close()
+
+    if json_out:
+        with open(json_out, "w", encoding="utf-8") as f:
+            json.dump({"config": vars(args), "responses": len(records), "bytes": nbytes, "passes": passes}, f, indent=2)
+        print(f"wrote {json_out}")
+
+
+if __name__ == "__main__":
+    main()